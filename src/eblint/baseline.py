@@ -0,0 +1,174 @@
+import hashlib
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .diagnostic import Diagnostic
+
+Fingerprint = Tuple[str, str, str, str, int]
+
+
+class Baseline:
+    """Known problems that should not be reported.
+
+    Problems are identified by a fingerprint of issue code (tagged with its
+    profile), file, field name, a hash of the message and an occurrence index that
+    tells apart identical problems in the same file. The fingerprint does not
+    contain the position of the problem, so it stays the same when lines are added
+    or removed around it.
+    Problems that prevent a file from being checked are never recorded.
+
+    Attributes:
+        fingerprints: fingerprints of the known problems
+    """
+
+    VERSION = 1
+    HASH_LENGTH = 16
+
+    def __init__(self, fingerprints: Iterable[Fingerprint] = ()):
+        """Initiate Baseline.
+
+        Args:
+            fingerprints: fingerprints of the known problems
+        """
+        self.fingerprints: Set[Fingerprint] = {tuple(f) for f in fingerprints}
+
+    @classmethod
+    def fingerprint(cls, diagnostic: Diagnostic, occurrence: int = 0) -> Fingerprint:
+        """Compute the fingerprint of a problem.
+
+        Args:
+            diagnostic: problem to be fingerprinted
+            occurrence: number of identical problems before it in the same file
+        """
+        message_hash = hashlib.sha256(diagnostic.message.encode("utf-8")).hexdigest()
+        return (
+            diagnostic.qualified_code,
+            os.path.normpath(diagnostic.filename),
+            diagnostic.field,
+            message_hash[: cls.HASH_LENGTH],
+            occurrence,
+        )
+
+    @classmethod
+    def file_fingerprints(
+        cls, diagnostics: Iterable[Diagnostic]
+    ) -> List[Optional[Fingerprint]]:
+        """Compute the fingerprints of the problems found in a file.
+
+        Identical problems are numbered in the order they are given, which is
+        the order of their position in the file.
+
+        Args:
+            diagnostics: problems found in a file
+
+        Returns:
+            the fingerprint of every problem, or None for problems that cannot be
+            recorded
+        """
+        fingerprints: List[Optional[Fingerprint]] = []
+        occurrences: Dict[Fingerprint, int] = {}
+        for diagnostic in diagnostics:
+            if not cls.is_recordable(diagnostic):
+                fingerprints.append(None)
+                continue
+            first = cls.fingerprint(diagnostic)
+            occurrence = occurrences.get(first, 0)
+            occurrences[first] = occurrence + 1
+            fingerprints.append(cls.fingerprint(diagnostic, occurrence))
+        return fingerprints
+
+    @staticmethod
+    def is_recordable(diagnostic: Diagnostic) -> bool:
+        """Whether a problem can be recorded in a baseline.
+
+        Parse, checker and read errors are not, as they should be fixed rather than
+        kept.
+        """
+        return not diagnostic.issue_code.startswith("E9")
+
+    def __len__(self) -> int:
+        return len(self.fingerprints)
+
+    def add(self, diagnostics: Iterable[Diagnostic]):
+        """Record the problems found in a file.
+
+        Args:
+            diagnostics: problems found in a file, sorted by position
+        """
+        self.fingerprints.update(
+            f for f in self.file_fingerprints(diagnostics) if f is not None
+        )
+
+    def filter(
+        self, results: Iterable[Tuple[str, List[Diagnostic]]]
+    ) -> Iterator[Tuple[str, List[Diagnostic]]]:
+        """Remove the known problems from a stream of lint results.
+
+        Args:
+            results: paths and problems of linted files
+        """
+        for path, diagnostics in results:
+            fingerprints = self.file_fingerprints(diagnostics)
+            yield path, [
+                d
+                for d, f in zip(diagnostics, fingerprints)
+                if f not in self.fingerprints
+            ]
+
+    def record(
+        self, results: Iterable[Tuple[str, List[Diagnostic]]]
+    ) -> Iterator[Tuple[str, List[Diagnostic]]]:
+        """Record the problems in a stream of lint results.
+
+        Args:
+            results: paths and problems of linted files
+
+        Yields:
+            the path and the problems that cannot be recorded of every file
+        """
+        for path, diagnostics in results:
+            self.add(diagnostics)
+            yield path, [d for d in diagnostics if not self.is_recordable(d)]
+
+    @classmethod
+    def from_results(
+        cls, results: Iterable[Tuple[str, List[Diagnostic]]]
+    ) -> "Baseline":
+        """Record all problems in a stream of lint results.
+
+        Args:
+            results: paths and problems of linted files
+        """
+        baseline = cls()
+        for _ in baseline.record(results):
+            pass
+        return baseline
+
+    @classmethod
+    def load(cls, path: str) -> "Baseline":
+        """Read a baseline from a file.
+
+        Args:
+            path: file written by `Baseline.write`
+        """
+        with open(path, "r") as baseline_file:
+            content = json.load(baseline_file)
+        if content.get("version") != cls.VERSION:
+            raise ValueError(
+                f"Unsupported baseline version {content.get('version')} in {path}"
+            )
+        return cls(content["fingerprints"])
+
+    def write(self, path: str):
+        """Write the baseline to a file.
+
+        Args:
+            path: file to write the baseline to
+        """
+        # One fingerprint per line keeps changes to the baseline easy to review.
+        lines = [json.dumps(list(f)) for f in sorted(self.fingerprints)]
+        with open(path, "w") as baseline_file:
+            baseline_file.write(f'{{"version": {self.VERSION}, "fingerprints": [\n')
+            baseline_file.write(",\n".join(lines))
+            baseline_file.write("\n]}\n")
@@ -58,3 +58,16 @@ class DependencyFormatChecker(Checker):
             else:
                 self.stored_names.update({target.id: node.value})
         super().generic_visit(node)
+
+    def visit_Module(self, node: ast.Module):
+        """Visit a module.
+
+        Afterwards, the stored variable definitions are discarded.
+
+        Args:
+            node: module to be visited
+        """
+        try:
+            super().generic_visit(node)
+        finally:
+            self.stored_names = {}
@@ -87,8 +87,10 @@ class FieldOrderChecker(Checker):
         Args:
             node: the file to be visited
         """
-        super().generic_visit(node)
-        self.seen_ordered_fields = []
-        self.seen_ordered_fields_indices = [
-            -1,
-        ]
+        try:
+            super().generic_visit(node)
+        finally:
+            self.seen_ordered_fields = []
+            self.seen_ordered_fields_indices = [
+                -1,
+            ]
@@ -43,15 +43,17 @@ class LastFieldChecker(Checker):
         Args:
             node: module to be visited.
         """
-        super().generic_visit(node)
-        if (
-            self.last_visited_field_node is not None
-            and self.last_visited_field_node.id != self.last_field_name
-        ):
-            self.violations.add(
-                Violation(
-                    self.last_visited_field_node,
-                    f"Last defined field must be '{self.last_field_name}'",
+        try:
+            super().generic_visit(node)
+            if (
+                self.last_visited_field_node is not None
+                and self.last_visited_field_node.id != self.last_field_name
+            ):
+                self.violations.add(
+                    Violation(
+                        self.last_visited_field_node,
+                        f"Last defined field must be '{self.last_field_name}'",
+                    )
                 )
-            )
-        self.last_visited_field_node = None
+        finally:
+            self.last_visited_field_node = None
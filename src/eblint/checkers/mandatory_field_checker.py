@@ -43,10 +43,12 @@ class MandatoryFieldChecker(Checker):
         Args:
             node: module to be visited
         """
-        super().generic_visit(node)
-        for name in self.mandatory_field_names:
-            if name not in self.seen_field_names:
-                self.violations.add(
-                    Violation(node, f"Missing mandatory field '{name}'")
-                )
-        self.seen_field_names = []
+        try:
+            super().generic_visit(node)
+            for name in self.mandatory_field_names:
+                if name not in self.seen_field_names:
+                    self.violations.add(
+                        Violation(node, f"Missing mandatory field '{name}'")
+                    )
+        finally:
+            self.seen_field_names = []
@@ -0,0 +1,43 @@
+from typing import NamedTuple
+
+
+def qualified_code(issue_code: str, profile: str = "") -> str:
+    """Combine an issue code with the name of the profile that reported it.
+
+    Args:
+        issue_code: unique identifier for a type of problem
+        profile: name of a rule profile, empty for the default rules
+    """
+    return f"{issue_code}[{profile}]" if profile else issue_code
+
+
+class Diagnostic(NamedTuple):
+    """A problem reported by the linter for a particular file.
+
+    Attributes:
+        filename: file in which the problem was found
+        lineno: line number of the problem, starting at 1
+        col_offset: column offset of the problem, starting at 0
+        issue_code: unique identifier for this type of problem
+        message: message to display
+        field: name of the field involved in the problem, if any
+        profile: name of the rule profile that reported the problem, if any
+    """
+    filename: str
+    lineno: int
+    col_offset: int
+    issue_code: str
+    message: str
+    field: str = ""
+    profile: str = ""
+
+    @property
+    def qualified_code(self) -> str:
+        """Issue code tagged with the profile that reported it."""
+        return qualified_code(self.issue_code, self.profile)
+
+    def __str__(self) -> str:
+        return (
+            f"{self.filename}:{self.lineno}:{self.col_offset}: "
+            f"{self.qualified_code}: {self.message}"
+        )
@@ -0,0 +1,380 @@
+import abc
+import ast
+import csv
+import json
+import os
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# Fields with a bit in the presence bitmap. Bit i is set when FIELD_NAMES[i] is
+# defined. New fields must be appended, to keep the bits of existing fields.
+FIELD_NAMES = (
+    "easyblock",
+    "name",
+    "version",
+    "versionsuffix",
+    "homepage",
+    "description",
+    "docurls",
+    "toolchain",
+    "toolchainopts",
+    "github_account",
+    "source_urls",
+    "sources",
+    "download_instructions",
+    "patches",
+    "crates",
+    "checksums",
+    "osdependencies",
+    "allow_system_deps",
+    "builddependencies",
+    "dependencies",
+    "start_dir",
+    "preconfigopts",
+    "configopts",
+    "prebuildopts",
+    "buildopts",
+    "preinstallopts",
+    "installopts",
+    "runtest",
+    "postinstallcmds",
+    "fix_python_shebang_for",
+    "exts_defaultclass",
+    "exts_default_options",
+    "exts_list",
+    "sanity_check_paths",
+    "sanity_check_commands",
+    "modextravars",
+    "modluafooter",
+    "modtclfooter",
+    "moduleclass",
+    "accept_eula",
+)
+_FIELD_BITS = {name: 1 << index for index, name in enumerate(FIELD_NAMES)}
+
+
+class EasyconfigRecord(NamedTuple):
+    """The fields of an easyconfig file, as one row of a table.
+
+    Values that are not literal strings are given as their source code, for
+    example `SYSTEM` or `version`.
+
+    Attributes:
+        path: path to the easyconfig file
+        name: value of the name field
+        version: value of the version field
+        versionsuffix: value of the versionsuffix field
+        toolchain_name: name of the toolchain
+        toolchain_version: version of the toolchain
+        field_mask: presence bitmap of the fields in `FIELD_NAMES`
+        fields: all defined fields, in order of definition
+        dependencies: the dependency tuples
+        builddependencies: the build dependency tuples
+    """
+    path: str
+    name: str
+    version: str
+    versionsuffix: str
+    toolchain_name: str
+    toolchain_version: str
+    field_mask: int
+    fields: Tuple[str, ...]
+    dependencies: Tuple[Tuple[str, ...], ...]
+    builddependencies: Tuple[Tuple[str, ...], ...]
+
+
+def _text(node: Optional[ast.expr]) -> str:
+    """Give the value of a literal, or the source code of any other expression."""
+    if node is None:
+        return ""
+    if isinstance(node, ast.Constant):
+        return str(node.value)
+    return ast.unparse(node)
+
+
+def _toolchain(node: Optional[ast.expr]) -> Tuple[str, str]:
+    """Give the name and version of a toolchain definition."""
+    if isinstance(node, ast.Dict):
+        entries = {
+            _text(key): value for key, value in zip(node.keys, node.values) if key
+        }
+        return _text(entries.get("name")), _text(entries.get("version"))
+    return _text(node), ""
+
+
+def _dependencies(node: Optional[ast.expr]) -> Tuple[Tuple[str, ...], ...]:
+    """Give the elements of every tuple in a dependency list."""
+    if not isinstance(node, (ast.List, ast.Tuple)):
+        return ()
+    return tuple(
+        tuple(_text(element) for element in child.elts)
+        for child in node.elts
+        if isinstance(child, ast.Tuple)
+    )
+
+
+def extract(path: str, tree: ast.Module) -> EasyconfigRecord:
+    """Collect the fields of a parsed easyconfig file.
+
+    Only assignments at the top level of the file define fields.
+
+    Args:
+        path: path to the easyconfig file
+        tree: parsed contents of the easyconfig file
+    """
+    fields: List[str] = []
+    values: Dict[str, ast.expr] = {}
+    for statement in tree.body:
+        if not isinstance(statement, ast.Assign):
+            continue
+        for target in statement.targets:
+            if isinstance(target, ast.Name):
+                fields.append(target.id)
+                values[target.id] = statement.value
+
+    field_mask = 0
+    for field in fields:
+        field_mask |= _FIELD_BITS.get(field, 0)
+
+    toolchain_name, toolchain_version = _toolchain(values.get("toolchain"))
+    return EasyconfigRecord(
+        path=path,
+        name=_text(values.get("name")),
+        version=_text(values.get("version")),
+        versionsuffix=_text(values.get("versionsuffix")),
+        toolchain_name=toolchain_name,
+        toolchain_version=toolchain_version,
+        field_mask=field_mask,
+        fields=tuple(fields),
+        dependencies=_dependencies(values.get("dependencies")),
+        builddependencies=_dependencies(values.get("builddependencies")),
+    )
+
+
+class DumpWriter(abc.ABC):
+    """Writes easyconfig records to a file.
+
+    Writers are used as context managers, so that the file is finished when all
+    records were added.
+    """
+
+    @abc.abstractmethod
+    def add(self, record: EasyconfigRecord):
+        """Add a record.
+
+        Args:
+            record: record to be added
+        """
+
+    def close(self, complete: bool = True):
+        """Finish writing.
+
+        Args:
+            complete: whether all records were added
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close(complete=exc_type is None)
+
+
+class CsvDumpWriter(DumpWriter):
+    """Writes easyconfig records to a CSV file, one row at a time.
+
+    The fields are separated by spaces, and the dependency tuples are written as
+    JSON lists.
+    """
+
+    def __init__(self, output_path: str):
+        """Initiate CsvDumpWriter.
+
+        Args:
+            output_path: file to write the records to
+        """
+        self._file = open(output_path, "w", newline="")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(EasyconfigRecord._fields)
+
+    def add(self, record: EasyconfigRecord):
+        self._writer.writerow(
+            record._replace(
+                fields=" ".join(record.fields),
+                dependencies=json.dumps(record.dependencies),
+                builddependencies=json.dumps(record.builddependencies),
+            )
+        )
+
+    def close(self, complete: bool = True):
+        self._file.close()
+
+
+class ColumnarDumpWriter(DumpWriter):
+    """Collects easyconfig records in columns, and writes them in batches.
+
+    Attributes:
+        output_path: file to write the records to
+        batch_size: number of records collected before they are written
+        columns: values of the collected records by column name
+    """
+
+    DEFAULT_BATCH_SIZE = 4096
+
+    def __init__(self, output_path: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        """Initiate ColumnarDumpWriter.
+
+        Args:
+            output_path: file to write the records to
+            batch_size: number of records collected before they are written
+        """
+        self.output_path = output_path
+        self.batch_size = batch_size
+        self.columns = self._empty_columns()
+
+    @staticmethod
+    def _empty_columns() -> Dict[str, list]:
+        return {name: [] for name in EasyconfigRecord._fields}
+
+    def add(self, record: EasyconfigRecord):
+        for name, value in zip(EasyconfigRecord._fields, record):
+            self.columns[name].append(value)
+        if len(self.columns["path"]) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write the collected records, and start a new batch."""
+        if self.columns["path"]:
+            self.write_batch(self.columns)
+            self.columns = self._empty_columns()
+
+    def close(self, complete: bool = True):
+        if complete:
+            self.flush()
+        self.finish(complete)
+
+    @abc.abstractmethod
+    def write_batch(self, columns: Dict[str, list]):
+        """Write a batch of records.
+
+        Args:
+            columns: values of the records by column name
+        """
+
+    @abc.abstractmethod
+    def finish(self, complete: bool):
+        """Finish the output file after the last batch.
+
+        Args:
+            complete: whether all records were added
+        """
+
+
+class NpzDumpWriter(ColumnarDumpWriter):
+    """Writes easyconfig records to a compressed NumPy archive.
+
+    Every column is stored as an array. The presence bitmap is also stored
+    unpacked, as the boolean array `presence` with a column per field in
+    `field_names`. Fields and dependency tuples are stored as JSON strings, so
+    that the archive can be loaded without pickle.
+
+    An archive cannot be appended to, so every batch is converted to compact
+    arrays that are kept until all records were added.
+    """
+
+    def __init__(self, output_path: str, **kwargs):
+        try:
+            import numpy
+        except ImportError as error:
+            raise ImportError(
+                "The npz format requires numpy, install eblint[npz]"
+            ) from error
+        self._numpy = numpy
+        self._batches: List[Dict[str, object]] = []
+        super().__init__(output_path, **kwargs)
+
+    def write_batch(self, columns: Dict[str, list]):
+        numpy = self._numpy
+        arrays = {}
+        for name, values in columns.items():
+            if name == "field_mask":
+                arrays[name] = numpy.array(values, dtype=numpy.int64)
+            elif name in ("fields", "dependencies", "builddependencies"):
+                arrays[name] = numpy.array(
+                    [json.dumps(value) for value in values], dtype=str
+                )
+            else:
+                arrays[name] = numpy.array(values, dtype=str)
+        self._batches.append(arrays)
+
+    def finish(self, complete: bool):
+        if not complete:
+            return
+        numpy = self._numpy
+        if not self._batches:
+            self.write_batch(self._empty_columns())
+        arrays = {
+            name: numpy.concatenate([batch[name] for batch in self._batches])
+            for name in EasyconfigRecord._fields
+        }
+        self._batches = []
+        bits = numpy.int64(1) << numpy.arange(len(FIELD_NAMES), dtype=numpy.int64)
+        arrays["presence"] = (arrays["field_mask"][:, None] & bits) != 0
+        arrays["field_names"] = numpy.array(FIELD_NAMES, dtype=str)
+        with open(self.output_path, "wb") as output_file:
+            numpy.savez_compressed(output_file, **arrays)
+
+
+class ParquetDumpWriter(ColumnarDumpWriter):
+    """Writes easyconfig records to a Parquet file, a row group per batch.
+
+    Fields are stored as a list of strings and dependency tuples as a list of lists
+    of strings. The names of the fields in the presence bitmap are stored in the
+    metadata of the file. An incomplete file is removed.
+    """
+
+    def __init__(self, output_path: str, **kwargs):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as error:
+            raise ImportError(
+                "The parquet-compatible format requires pyarrow, "
+                "install eblint[parquet]"
+            ) from error
+        self._pyarrow = pyarrow
+        super().__init__(output_path, **kwargs)
+        dependency_type = pyarrow.list_(pyarrow.list_(pyarrow.string()))
+        self._schema = pyarrow.schema(
+            [(name, pyarrow.string()) for name in EasyconfigRecord._fields[:6]]
+            + [
+                ("field_mask", pyarrow.int64()),
+                ("fields", pyarrow.list_(pyarrow.string())),
+                ("dependencies", dependency_type),
+                ("builddependencies", dependency_type),
+            ],
+            metadata={"field_names": json.dumps(FIELD_NAMES)},
+        )
+        self._writer = pyarrow.parquet.ParquetWriter(output_path, self._schema)
+
+    def write_batch(self, columns: Dict[str, list]):
+        columns = dict(columns)
+        columns["fields"] = [list(fields) for fields in columns["fields"]]
+        for name in ("dependencies", "builddependencies"):
+            columns[name] = [
+                [list(dependency) for dependency in dependencies]
+                for dependencies in columns[name]
+            ]
+        self._writer.write_table(self._pyarrow.table(columns, schema=self._schema))
+
+    def finish(self, complete: bool):
+        self._writer.close()
+        if not complete:
+            os.remove(self.output_path)
+
+
+WRITERS = {
+    "csv": CsvDumpWriter,
+    "parquet-compatible": ParquetDumpWriter,
+    "npz": NpzDumpWriter,
+}
+FORMATS = tuple(WRITERS)
@@ -1,22 +1,80 @@
 import argparse
 import ast
-from typing import Optional, Set, Union
+import asyncio
+import contextlib
+import sys
+import threading
+import time
+import weakref
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import (
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
+from . import dump, pipeline, sharding, watch
+from . import results as eblint_results
+from .baseline import Baseline
 from .checkers import DEFAULT_CHECKERS, Checker
+from .diagnostic import Diagnostic, qualified_code
+from .statistics import LintStatistics
+
+# Checkers keep state while visiting a tree, and the same instances can be used by
+# several linters, as with DEFAULT_CHECKERS. Every checker therefore has a lock of
+# its own, which is not part of the checker so that it can still be pickled.
+_checker_locks: "weakref.WeakKeyDictionary[Checker, threading.Lock]" = (
+    weakref.WeakKeyDictionary()
+)
+_checker_locks_lock = threading.Lock()
+
+
+def _checker_lock(checker: Checker) -> threading.Lock:
+    """Get the lock that guards the state of a checker."""
+    with _checker_locks_lock:
+        return _checker_locks.setdefault(checker, threading.Lock())
 
 
 class Linter:
     """A linter interface to run a file through multiple checkers.
 
+    Problems that prevent a file from being checked do not stop the linter. A file
+    that cannot be parsed is reported with `PARSE_ERROR_CODE`, a checker that fails
+    on a file with `CHECKER_ERROR_CODE`, and a file that cannot be read with
+    `READ_ERROR_CODE`.
+
+    Besides its own checkers, a linter can run named profiles of checkers. Every
+    file is parsed once for all profiles, and the problems found by a profile are
+    tagged with its name. A checker that is part of several profiles only visits
+    a file once.
+
     Attributes:
         checkers: collection of objects that check rules
+        profiles: collections of checkers by profile name
+        statistics: counters collected over all runs of the linter
     """
 
-    def __init__(self, checkers: Optional[Union[Checker, Set[Checker]]] = None):
+    PARSE_ERROR_CODE = "E900"
+    CHECKER_ERROR_CODE = "E901"
+    READ_ERROR_CODE = "E902"
+
+    def __init__(
+        self,
+        checkers: Optional[Union[Checker, Set[Checker]]] = None,
+        profiles: Optional[Dict[str, Set[Checker]]] = None,
+    ):
         """Initiate a linter.
 
         Args:
             checkers: the rule checkers to be attached to the linter
+            profiles: named collections of rule checkers to be run as well
         """
         if checkers is None:
             self.checkers = set()
@@ -24,6 +82,34 @@ class Linter:
             self.checkers = {checkers}
         else:
             self.checkers = checkers
+        self.profiles = {} if profiles is None else profiles
+        self.statistics = LintStatistics()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def violation_diagnostics(checker: Checker, filename: str) -> List[Diagnostic]:
+        """Collect the violations found by a checker in a single file.
+
+        Args:
+            checker: checker whose violations to collect
+            filename: file in which the violations where found
+
+        Returns:
+            the violations as diagnostics, sorted by position
+        """
+        diagnostics = []
+        for node, message in checker.violations:
+            if isinstance(node, ast.expr):
+                lineno, col_offset = node.lineno, node.col_offset
+            else:
+                lineno, col_offset = 1, 0
+            field = node.id if isinstance(node, ast.Name) else ""
+            diagnostics.append(
+                Diagnostic(
+                    filename, lineno, col_offset, checker.issue_code, message, field
+                )
+            )
+        return sorted(diagnostics)
 
     @staticmethod
     def print_violations(checker: Checker, filename: str):
@@ -33,16 +119,231 @@ class Linter:
             checker: checker whose violations to print
             filename: file in which the violations where found
         """
-        for node, message in checker.violations:
-            if isinstance(node, ast.expr):
-                print(
-                    f"{filename}:{node.lineno}:{node.col_offset}: "
-                    f"{checker.issue_code}: {message}"
+        for diagnostic in Linter.violation_diagnostics(checker, filename):
+            print(diagnostic)
+
+    def read_source(self, source_path: str) -> bytes:
+        """Read the contents of a file.
+
+        Args:
+            source_path: path to the file to be read
+
+        Returns:
+            the raw contents of the file
+        """
+        with open(source_path, "rb") as source_file:
+            source_code = source_file.read()
+        with self._lock:
+            self.statistics.bytes_read += len(source_code)
+        return source_code
+
+    def read_file(self, source_path: str) -> Tuple[Optional[bytes], List[Diagnostic]]:
+        """Read the contents of a file, reporting a file that cannot be read.
+
+        Args:
+            source_path: path to the file to be read
+
+        Returns:
+            the raw contents of the file, or None if it could not be read, and the
+            problems found while reading
+        """
+        try:
+            return self.read_source(source_path), []
+        except OSError as error:
+            with self._lock:
+                self.statistics.read_failures += 1
+            message = error.strerror or str(error)
+            return None, [
+                Diagnostic(
+                    source_path,
+                    1,
+                    0,
+                    self.READ_ERROR_CODE,
+                    f"Could not read file: {message}",
                 )
-            else:
-                print(f"{filename}:1:0: {checker.issue_code}: {message}")
+            ]
+
+    def parse_source(
+        self, source_code: Union[str, bytes], source_path: str = "<unknown>"
+    ) -> Tuple[Optional[ast.Module], List[Diagnostic]]:
+        """Parse source code.
+
+        Args:
+            source_code: contents of an easyconfig file
+            source_path: path used to identify the source code in diagnostics
+
+        Returns:
+            the parsed tree, or None if the source code could not be parsed, and
+            the problems found while parsing
+        """
+        try:
+            tree = ast.parse(source_code, filename=source_path)
+        except (SyntaxError, ValueError, RecursionError, MemoryError) as error:
+            # Deeply nested expressions exhaust the recursion limit or the memory
+            # of the parser, which must not stop the other files.
+            with self._lock:
+                self.statistics.files_linted += 1
+                self.statistics.parse_failures += 1
+            return None, [self._parse_error_diagnostic(error, source_path)]
+        with self._lock:
+            self.statistics.files_linted += 1
+        return tree, []
+
+    def lint_tree(
+        self, tree: ast.Module, source_path: str = "<unknown>", cleanup: bool = True
+    ) -> List[Diagnostic]:
+        """Run a parsed file through the checkers.
 
-    def run(self, source_path: str, cleanup: bool = True):
+        Args:
+            tree: parsed contents of an easyconfig file
+            source_path: path used to identify the source code in diagnostics
+            cleanup: whether to reset the checkers to a clean state afterwards.
+
+        Returns:
+            the problems found in the tree
+        """
+        diagnostics = []
+        checked: Dict[Checker, List[Diagnostic]] = {}
+        with self._lock_checkers():
+            for profile, checkers in self._profile_items():
+                for checker in checkers:
+                    if checker not in checked:
+                        checked[checker] = self._run_checker(
+                            checker, tree, source_path
+                        )
+                    found = checked[checker]
+                    if profile:
+                        found = [d._replace(profile=profile) for d in found]
+                    diagnostics.extend(found)
+                    if not any(
+                        d.issue_code == self.CHECKER_ERROR_CODE for d in found
+                    ):
+                        self.statistics.add_violations(
+                            qualified_code(checker.issue_code, profile), len(found)
+                        )
+
+            if cleanup is True:
+                self.clear_violations()
+        diagnostics.sort()
+
+        return diagnostics
+
+    def _profile_items(self) -> List[Tuple[str, Set[Checker]]]:
+        """List the checkers of the linter itself and of every profile."""
+        return [("", self.checkers), *self.profiles.items()]
+
+    @contextlib.contextmanager
+    def _lock_checkers(self):
+        """Hold the locks of all checkers of the linter.
+
+        The locks are always taken in the same order, so that linters sharing
+        checkers cannot deadlock.
+        """
+        checkers = {c for _, checkers in self._profile_items() for c in checkers}
+        with contextlib.ExitStack() as stack:
+            for checker in sorted(checkers, key=id):
+                stack.enter_context(_checker_lock(checker))
+            yield
+
+    def _run_checker(
+        self, checker: Checker, tree: ast.Module, source_path: str
+    ) -> List[Diagnostic]:
+        """Run a single checker on a parsed file.
+
+        Returns:
+            the violations found, or a checker error if the checker failed
+        """
+        try:
+            checker.visit(tree)
+        except Exception as error:
+            self.statistics.checker_failures += 1
+            return [
+                Diagnostic(
+                    source_path,
+                    1,
+                    0,
+                    self.CHECKER_ERROR_CODE,
+                    f"Checker {checker.issue_code} failed: "
+                    f"{type(error).__name__}: {error}",
+                )
+            ]
+        return self.violation_diagnostics(checker, source_path)
+
+    def run_observer(
+        self,
+        observe: Callable[[str, ast.Module], None],
+        tree: ast.Module,
+        source_path: str,
+    ) -> List[Diagnostic]:
+        """Pass a parsed file to a function that reuses the parse.
+
+        A failing function is reported with `CHECKER_ERROR_CODE`, so that it does
+        not stop the linter, but counted separately from failing checkers.
+
+        Args:
+            observe: function called with the path and the parsed file
+            tree: parsed contents of an easyconfig file
+            source_path: path used to identify the source code in diagnostics
+
+        Returns:
+            a checker error if the function failed
+        """
+        try:
+            observe(source_path, tree)
+        except Exception as error:
+            self.statistics.observer_failures += 1
+            return [
+                Diagnostic(
+                    source_path,
+                    1,
+                    0,
+                    self.CHECKER_ERROR_CODE,
+                    f"Observer failed: {type(error).__name__}: {error}",
+                )
+            ]
+        return []
+
+    def lint_source(
+        self,
+        source_code: Union[str, bytes],
+        source_path: str = "<unknown>",
+        cleanup: bool = True,
+    ) -> List[Diagnostic]:
+        """Run source code through the linter.
+
+        Args:
+            source_code: contents of an easyconfig file
+            source_path: path used to identify the source code in diagnostics
+            cleanup: whether to reset the checkers to a clean state afterwards.
+
+        Returns:
+            the problems found in the source code
+        """
+        tree, diagnostics = self.parse_source(source_code, source_path)
+        if tree is None:
+            return diagnostics
+        return self.lint_tree(tree, source_path, cleanup=cleanup)
+
+    def _parse_error_diagnostic(
+        self, error: Exception, source_path: str
+    ) -> Diagnostic:
+        """Turn an exception raised by the parser into a diagnostic."""
+        if isinstance(error, SyntaxError):
+            lineno = error.lineno or 1
+            col_offset = max((error.offset or 1) - 1, 0)
+            message = error.msg
+        else:
+            lineno, col_offset = 1, 0
+            message = str(error) or type(error).__name__
+        return Diagnostic(
+            source_path,
+            lineno,
+            col_offset,
+            self.PARSE_ERROR_CODE,
+            f"Could not parse file: {message}",
+        )
+
+    def run(self, source_path: str, cleanup: bool = True) -> List[Diagnostic]:
         """Run a file through the linter.
 
         In between files it is important to reset the checkers to their original state.
@@ -51,39 +352,397 @@ class Linter:
         Args:
             source_path: path to the file to be checked
             cleanup: whether to reset the checkers to a clean state afterwards.
+
+        Returns:
+            the problems found in the file, which are also printed
         """
-        with open(source_path, "r") as source_file:
-            source_code = source_file.read()
+        start_time = time.perf_counter()
+        try:
+            source_code, diagnostics = self.read_file(source_path)
+            if source_code is not None:
+                diagnostics = self.lint_source(
+                    source_code, source_path, cleanup=cleanup
+                )
+        finally:
+            self.statistics.wall_time += time.perf_counter() - start_time
 
-        tree = ast.parse(source_code, filename=source_path)
-        for checker in self.checkers:
-            checker.visit(tree)
-            self.print_violations(checker, source_path)
+        for diagnostic in diagnostics:
+            print(diagnostic)
+        return diagnostics
 
-        if cleanup is True:
-            self.clear_violations()
+    def _lint_tree_exclusive(
+        self, tree: ast.Module, source_path: str
+    ) -> List[Diagnostic]:
+        """Run a parsed file through the checkers, one caller at a time.
+
+        The checkers guard their own state, see `lint_tree`, but the statistics of
+        the linter are shared by concurrent callers. Parsing needs no such
+        protection.
+        """
+        with self._lock:
+            return self.lint_tree(tree, source_path)
+
+    @staticmethod
+    def _thread_executor(executor: Optional[Executor]) -> Optional[Executor]:
+        """Choose the executor to read files in.
+
+        Reading updates the statistics of the linter, so it cannot be done in
+        another process. The default executor of the loop is used instead.
+        """
+        if isinstance(executor, ProcessPoolExecutor):
+            return None
+        return executor
+
+    async def read_source_async(
+        self, source_path: str, executor: Optional[Executor] = None
+    ) -> bytes:
+        """Read the contents of a file without blocking the event loop.
+
+        Args:
+            source_path: path to the file to be read
+            executor: executor to read the file in, defaults to that of the loop
+
+        Returns:
+            the raw contents of the file
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._thread_executor(executor), self.read_source, source_path
+        )
+
+    async def lint_source_async(
+        self,
+        source_code: Union[str, bytes],
+        source_path: str = "<unknown>",
+        executor: Optional[Executor] = None,
+    ) -> List[Diagnostic]:
+        """Run source code through the linter without blocking the event loop.
+
+        Parsing and checking are done in the executor. Concurrent calls are parsed
+        in parallel, but a checker checks one file at a time, as it keeps state.
+        This also holds for checkers shared by several linters.
+
+        A `ProcessPoolExecutor` lints with copies of the checkers in its worker
+        processes, so files are also checked in parallel. The statistics of every
+        file are added to those of the linter afterwards.
+
+        Args:
+            source_code: contents of an easyconfig file
+            source_path: path used to identify the source code in diagnostics
+            executor: executor to lint in, defaults to that of the loop
+
+        Returns:
+            the problems found in the source code
+        """
+        loop = asyncio.get_running_loop()
+        if isinstance(executor, ProcessPoolExecutor):
+            diagnostics, statistics = await loop.run_in_executor(
+                executor,
+                _lint_detached,
+                self.checkers,
+                self.profiles,
+                source_code,
+                source_path,
+            )
+            with self._lock:
+                self.statistics.merge(statistics)
+            return diagnostics
+        tree, diagnostics = await loop.run_in_executor(
+            executor, self.parse_source, source_code, source_path
+        )
+        if tree is None:
+            return diagnostics
+        return await loop.run_in_executor(
+            executor, self._lint_tree_exclusive, tree, source_path
+        )
+
+    async def lint_file_async(
+        self, source_path: str, executor: Optional[Executor] = None
+    ) -> List[Diagnostic]:
+        """Run a file through the linter without blocking the event loop.
+
+        Args:
+            source_path: path to the file to be checked
+            executor: executor to read and lint in, defaults to that of the loop
+
+        Returns:
+            the problems found in the file
+        """
+        loop = asyncio.get_running_loop()
+        source_code, diagnostics = await loop.run_in_executor(
+            self._thread_executor(executor), self.read_file, source_path
+        )
+        if source_code is None:
+            return diagnostics
+        return await self.lint_source_async(source_code, source_path, executor)
+
+    async def lint_paths_async(
+        self,
+        source_paths: Iterable[str],
+        executor: Optional[Executor] = None,
+        queue_size: int = pipeline.DEFAULT_QUEUE_SIZE,
+    ) -> AsyncIterator[Tuple[str, List[Diagnostic]]]:
+        """Run files through the linter without blocking the event loop.
+
+        Discovery and reading run in a background thread, at most `queue_size`
+        files ahead of the checkers, as in `eblint.pipeline.lint_paths`.
+
+        Args:
+            source_paths: files or directories to be linted
+            executor: executor to lint in, defaults to that of the loop
+            queue_size: maximum number of files read ahead of the checkers
+
+        Yields:
+            the path and the problems found for every file
+        """
+        start_time = time.perf_counter()
+        sources = pipeline.read(self, pipeline.discover(source_paths))
+        try:
+            async for path, source_code, diagnostics in pipeline.buffered_async(
+                sources, queue_size
+            ):
+                if source_code is not None:
+                    diagnostics = await self.lint_source_async(
+                        source_code, path, executor
+                    )
+                yield path, diagnostics
+        finally:
+            self.statistics.wall_time += time.perf_counter() - start_time
 
     def clear_violations(self):
-        for checker in self.checkers:
-            checker.clear_violations()
+        for _, checkers in self._profile_items():
+            for checker in checkers:
+                checker.clear_violations()
+
+
+def _lint_detached(
+    checkers: Set[Checker],
+    profiles: Dict[str, Set[Checker]],
+    source_code: Union[str, bytes],
+    source_path: str,
+) -> Tuple[List[Diagnostic], LintStatistics]:
+    """Run source code through a new linter, for example in a worker process.
+
+    Args:
+        checkers: the rule checkers of the linter
+        profiles: named collections of rule checkers of the linter
+        source_code: contents of an easyconfig file
+        source_path: path used to identify the source code in diagnostics
+
+    Returns:
+        the problems found in the source code, and the statistics of linting it
+    """
+    linter = Linter(checkers, profiles)
+    diagnostics = linter.lint_source(source_code, source_path)
+    return diagnostics, linter.statistics
+
+
+def _report(
+    results: Iterable[Tuple[str, List[Diagnostic]]],
+    results_path: Optional[str] = None,
+    positions: Optional[Iterable[int]] = None,
+    shard: Tuple[int, int] = (1, 1),
+    paths: Sequence[str] = (),
+) -> int:
+    """Print lint results, and write them to a results file if requested.
+
+    Returns:
+        the number of problems printed
+    """
+    if results_path is None:
+        return pipeline.report(results)
+    with open(results_path, "w") as results_file:
+        return pipeline.report(
+            eblint_results.record(
+                results, results_file, positions=positions, shard=shard, paths=paths
+            )
+        )
 
 
-def main():
+def merge_main(argv: List[str]) -> int:
+    """Function for the `eblint merge` command.
+
+    Args:
+        argv: command line arguments after `merge`
+
+    Returns:
+        the exit status, 1 if the merged results contain problems
+    """
+    parser = argparse.ArgumentParser(
+        prog="eblint merge",
+        description="Combine the results files of sharded eblint runs",
+    )
+    parser.add_argument("results", nargs="+", help="Results file[s] to be merged")
+    parser.add_argument(
+        "--results-file", help="Write the merged results to this file as well"
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        (shard, paths), results = eblint_results.merge(args.results)
+    except ValueError as error:
+        parser.error(str(error))
+    problem_count = _report(results, args.results_file, shard=shard, paths=paths)
+    return 1 if problem_count > 0 else 0
+
+
+def dump_main(argv: List[str]) -> int:
+    """Function for the `eblint dump` command.
+
+    Args:
+        argv: command line arguments after `dump`
+
+    Returns:
+        the exit status, 1 if problems were reported
+    """
+    parser = argparse.ArgumentParser(
+        prog="eblint dump",
+        description="Lint files and write a table of their fields",
+    )
+    parser.add_argument(
+        "filename",
+        nargs="+",
+        help="File[s] to be linted, directories are searched for .eb files",
+    )
+    parser.add_argument(
+        "--format",
+        choices=dump.FORMATS,
+        default="csv",
+        help="Format of the table (default: csv)",
+    )
+    parser.add_argument(
+        "-o", "--output", required=True, help="File to write the table to"
+    )
+    args = parser.parse_args(argv)
+
+    linter = Linter(checkers=DEFAULT_CHECKERS)
+    try:
+        writer = dump.WRITERS[args.format](args.output)
+    except ImportError as error:
+        parser.error(str(error))
+    with writer:
+        results = pipeline.lint_paths(
+            linter,
+            args.filename,
+            observe=lambda path, tree: writer.add(dump.extract(path, tree)),
+        )
+        problem_count = pipeline.report(results)
+    return 1 if problem_count > 0 else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
     """Function for command line interface
 
     This function is invoked by the `eblint` command.
+
+    Args:
+        argv: command line arguments, defaults to those of the process
+
+    Returns:
+        the exit status, 1 if problems were reported
     """
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv[:1] == ["merge"]:
+        return merge_main(argv[1:])
+    if argv[:1] == ["dump"]:
+        return dump_main(argv[1:])
+
     parser = argparse.ArgumentParser(
-        prog="eblint", description="A linter for easybuild easyconfig files"
+        prog="eblint",
+        description="A linter for easybuild easyconfig files",
+        epilog="Use 'eblint merge' to combine the results files of sharded runs, "
+        "and 'eblint dump' to write a table of the fields of easyconfig files.",
+    )
+    parser.add_argument(
+        "filename",
+        nargs="+",
+        help="File[s] to be linted, directories are searched for .eb files",
+    )
+    parser.add_argument(
+        "--stats-file", help="Write run statistics to this file after linting"
+    )
+    parser.add_argument(
+        "--stats-format",
+        choices=LintStatistics.FORMATS,
+        default="json",
+        help="Format of the statistics file (default: json)",
     )
-    parser.add_argument("filename", nargs="+", help="File[s] to be linted")
-    args = parser.parse_args()
+    baseline_group = parser.add_mutually_exclusive_group()
+    baseline_group.add_argument(
+        "--baseline", help="Do not report the problems recorded in this file"
+    )
+    baseline_group.add_argument(
+        "--write-baseline",
+        metavar="BASELINE",
+        help="Record the problems found in this file instead of reporting them, "
+        "except for errors that cannot be recorded",
+    )
+    parser.add_argument(
+        "--shard",
+        type=sharding.parse_shard,
+        metavar="i/N",
+        help="Only lint shard i of N shards of the files, balanced by file size",
+    )
+    parser.add_argument(
+        "--results-file",
+        help="Write the results to this file as well, to be combined by "
+        "'eblint merge'",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and relint files whenever they change on disk",
+    )
+    args = parser.parse_args(argv)
+    if args.watch and (
+        args.write_baseline is not None
+        or args.shard is not None
+        or args.results_file is not None
+    ):
+        parser.error(
+            "--watch cannot be combined with --write-baseline, --shard or "
+            "--results-file"
+        )
 
     linter = Linter(checkers=DEFAULT_CHECKERS)
 
-    for source_path in args.filename:
-        linter.run(source_path)
+    if args.watch:
+        baseline = None if args.baseline is None else Baseline.load(args.baseline)
+        problem_count = watch.watch(linter, args.filename, baseline=baseline)
+        if args.stats_file is not None:
+            linter.statistics.write(args.stats_file, format=args.stats_format)
+        return 1 if problem_count > 0 else 0
+
+    source_paths = args.filename
+    positions = None
+    if args.shard is not None:
+        shard = sharding.shard_paths(pipeline.discover(args.filename), *args.shard)
+        positions = [position for position, _ in shard]
+        source_paths = [path for _, path in shard]
+
+    results = pipeline.lint_paths(linter, source_paths)
+    if args.write_baseline is not None:
+        # Problems that cannot be recorded are still reported.
+        baseline = Baseline()
+        problem_count = pipeline.report(baseline.record(results))
+        baseline.write(args.write_baseline)
+    else:
+        if args.baseline is not None:
+            results = Baseline.load(args.baseline).filter(results)
+        problem_count = _report(
+            results,
+            args.results_file,
+            positions,
+            shard=args.shard or (1, 1),
+            paths=args.filename,
+        )
+
+    if args.stats_file is not None:
+        linter.statistics.write(args.stats_file, format=args.stats_format)
+
+    return 1 if problem_count > 0 else 0
 
 
 if __name__ == "__main__":  # pragma: no cover
-    main()
+    sys.exit(main())
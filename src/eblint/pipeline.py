@@ -0,0 +1,279 @@
+"""Streaming stages to lint arbitrarily many files in bounded memory.
+
+Linting is split in the stages discovery, read, parse, check and report. Every
+stage is a generator that consumes the output of the previous stage one item at a
+time, so no stage holds the full list of files or the full set of results.
+`buffered` runs the stages upstream of it in a background thread, connected by a
+bounded queue: the producer blocks as soon as the queue is full. `buffered_async`
+does the same for consumers running in an asyncio event loop.
+"""
+import ast
+import asyncio
+import concurrent.futures
+import os
+import queue
+import threading
+import time
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from .diagnostic import Diagnostic
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .linter import Linter
+
+DEFAULT_QUEUE_SIZE = 16
+EASYCONFIG_SUFFIX = ".eb"
+
+T = TypeVar("T")
+
+_ITEM, _ERROR, _DONE = range(3)
+
+
+def discover(paths: Iterable[str]) -> Iterator[str]:
+    """Yield the files to be linted.
+
+    Directories are searched recursively for easyconfig files, in sorted order.
+    Other paths are yielded as they are.
+
+    Args:
+        paths: files and directories to be linted
+    """
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path
+            continue
+        for root, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if filename.endswith(EASYCONFIG_SUFFIX):
+                    yield os.path.join(root, filename)
+
+
+def read(
+    linter: "Linter", paths: Iterable[str]
+) -> Iterator[Tuple[str, Optional[bytes], List[Diagnostic]]]:
+    """Read the contents of each file.
+
+    Files that cannot be read are passed on without contents, with a read error.
+
+    Args:
+        linter: linter keeping the statistics
+        paths: files to be read
+    """
+    for path in paths:
+        source_code, diagnostics = linter.read_file(path)
+        yield path, source_code, diagnostics
+
+
+def parse(
+    linter: "Linter",
+    sources: Iterable[Tuple[str, Optional[bytes], List[Diagnostic]]],
+) -> Iterator[Tuple[str, Optional[ast.Module], List[Diagnostic]]]:
+    """Parse the contents of each file.
+
+    Files that could not be read are passed on with their read errors.
+
+    Args:
+        linter: linter keeping the statistics
+        sources: paths, contents and read errors of files
+    """
+    for path, source_code, diagnostics in sources:
+        if source_code is None:
+            yield path, None, diagnostics
+            continue
+        tree, parse_diagnostics = linter.parse_source(source_code, path)
+        yield path, tree, diagnostics + parse_diagnostics
+
+
+def check(
+    linter: "Linter",
+    trees: Iterable[Tuple[str, Optional[ast.Module], List[Diagnostic]]],
+    observe: Optional[Callable[[str, ast.Module], None]] = None,
+) -> Iterator[Tuple[str, List[Diagnostic]]]:
+    """Run each parsed file through the checkers of the linter.
+
+    Files that could not be parsed are passed on with their parse errors.
+
+    Args:
+        linter: linter whose checkers to run
+        trees: paths, parsed contents and parse errors of files
+        observe: function called with the path and parsed contents of every file
+            that could be parsed, to reuse the parse for other purposes. If it
+            fails, a checker error is reported for the file.
+    """
+    for path, tree, diagnostics in trees:
+        if tree is not None:
+            if observe is not None:
+                diagnostics = diagnostics + linter.run_observer(observe, tree, path)
+            diagnostics = diagnostics + linter.lint_tree(tree, path)
+        yield path, diagnostics
+
+
+def report(
+    results: Iterable[Tuple[str, List[Diagnostic]]],
+    write: Callable[[str], None] = print,
+) -> int:
+    """Write out the problems found in each file.
+
+    Args:
+        results: paths and problems of linted files
+        write: function called with every formatted problem
+
+    Returns:
+        the number of problems written
+    """
+    count = 0
+    for _, diagnostics in results:
+        for diagnostic in diagnostics:
+            write(str(diagnostic))
+            count += 1
+    return count
+
+
+def _produce(iterable: Iterable, put: Callable[[tuple], bool]):
+    """Pass all items of an iterable to `put`, followed by an end marker.
+
+    Stops early when `put` returns False.
+    """
+    try:
+        for item in iterable:
+            if not put((_ITEM, item)):
+                return
+    except BaseException as error:
+        put((_ERROR, error))
+    else:
+        put((_DONE, None))
+
+
+def buffered(iterable: Iterable[T], maxsize: int = DEFAULT_QUEUE_SIZE) -> Iterator[T]:
+    """Consume an iterable in a background thread, through a bounded queue.
+
+    The background thread runs at most `maxsize` items ahead of the consumer.
+    Exceptions raised by the iterable are re-raised in the consumer, after the
+    items produced before them. With a `maxsize` of zero or less the iterable is
+    consumed in the calling thread.
+
+    Args:
+        iterable: items to be produced in the background
+        maxsize: maximum number of items waiting for the consumer
+    """
+    if maxsize <= 0:
+        yield from iterable
+        return
+
+    items: queue.Queue = queue.Queue(maxsize)
+    stopped = threading.Event()
+
+    def put(entry: tuple) -> bool:
+        while not stopped.is_set():
+            try:
+                items.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    producer = threading.Thread(
+        target=_produce, args=(iterable, put), name="eblint-producer", daemon=True
+    )
+    producer.start()
+    try:
+        while True:
+            kind, value = items.get()
+            if kind == _ITEM:
+                yield value
+            elif kind == _ERROR:
+                raise value
+            else:
+                return
+    finally:
+        stopped.set()
+        producer.join()
+
+
+async def buffered_async(
+    iterable: Iterable[T], maxsize: int = DEFAULT_QUEUE_SIZE
+) -> AsyncIterator[T]:
+    """Consume an iterable in a background thread, for use in an event loop.
+
+    This is the asynchronous counterpart of `buffered`: the iterable may block on
+    I/O without blocking the event loop. The background thread runs at most
+    `maxsize` items ahead of the consumer, and at least one.
+
+    Args:
+        iterable: items to be produced in the background
+        maxsize: maximum number of items waiting for the consumer
+    """
+    loop = asyncio.get_running_loop()
+    items: asyncio.Queue = asyncio.Queue(max(maxsize, 1))
+    stopped = threading.Event()
+
+    def put(entry: tuple) -> bool:
+        try:
+            future = asyncio.run_coroutine_threadsafe(items.put(entry), loop)
+        except RuntimeError:
+            # The event loop was closed before the consumer finished.
+            return False
+        while not stopped.is_set():
+            try:
+                future.result(timeout=0.1)
+                return True
+            except concurrent.futures.TimeoutError:
+                continue
+        future.cancel()
+        return False
+
+    producer = threading.Thread(
+        target=_produce, args=(iterable, put), name="eblint-producer", daemon=True
+    )
+    producer.start()
+    try:
+        while True:
+            kind, value = await items.get()
+            if kind == _ITEM:
+                yield value
+            elif kind == _ERROR:
+                raise value
+            else:
+                return
+    finally:
+        # The producer notices within a timeout and exits on its own; joining it
+        # here would block the event loop.
+        stopped.set()
+
+
+def lint_paths(
+    linter: "Linter",
+    paths: Iterable[str],
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    observe: Optional[Callable[[str, ast.Module], None]] = None,
+) -> Iterator[Tuple[str, List[Diagnostic]]]:
+    """Stream files through discovery, read, parse and check.
+
+    Discovery and reading run in a background thread, at most `queue_size` files
+    ahead of parsing and checking. The time until the last result is consumed is
+    added to the wall time of the linter.
+
+    Args:
+        linter: linter whose checkers to run
+        paths: files and directories to be linted
+        queue_size: maximum number of files read ahead of the checkers
+        observe: function called with the path and parsed contents of every file
+            that could be parsed
+    """
+    start_time = time.perf_counter()
+    sources = buffered(read(linter, discover(paths)), maxsize=queue_size)
+    try:
+        yield from check(linter, parse(linter, sources), observe=observe)
+    finally:
+        linter.statistics.wall_time += time.perf_counter() - start_time
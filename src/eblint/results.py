@@ -0,0 +1,141 @@
+import heapq
+import itertools
+import json
+from typing import IO, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .diagnostic import Diagnostic
+
+Header = Tuple[Tuple[int, int], List[str]]
+
+
+def record(
+    results: Iterable[Tuple[str, List[Diagnostic]]],
+    results_file: IO[str],
+    positions: Optional[Iterable[int]] = None,
+    shard: Tuple[int, int] = (1, 1),
+    paths: Sequence[str] = (),
+) -> Iterator[Tuple[str, List[Diagnostic]]]:
+    """Write lint results to a structured results file and pass them on.
+
+    The first line of the file describes the run, with the shard as `i/N` and the
+    files and directories given to eblint. Every linted file is then written as a
+    JSON object on a line of its own, with its position in the discovery order,
+    its path and its problems.
+
+    Args:
+        results: paths and problems of linted files
+        results_file: file to write the results to
+        positions: position in the discovery order of every result, defaults to
+            the order of the results
+        shard: number of the shard that was linted and the number of shards
+        paths: files and directories given to eblint
+    """
+    header = {"shard": f"{shard[0]}/{shard[1]}", "paths": list(paths)}
+    results_file.write(json.dumps(header) + "\n")
+    if positions is None:
+        positions = itertools.count()
+    for position, (path, diagnostics) in zip(positions, results):
+        entry = {
+            "position": position,
+            "path": path,
+            "diagnostics": [list(diagnostic) for diagnostic in diagnostics],
+        }
+        results_file.write(json.dumps(entry) + "\n")
+        yield path, diagnostics
+
+
+def read_header(results_path: str) -> Header:
+    """Read the description of the run from a results file written by `record`.
+
+    Args:
+        results_path: path to the results file
+
+    Returns:
+        the shard number and the number of shards, and the files and directories
+        given to eblint
+
+    Raises:
+        ValueError: the file is not a results file
+    """
+    with open(results_path, "r") as results_file:
+        try:
+            header = json.loads(results_file.readline())
+            index, count = (int(part) for part in header["shard"].split("/"))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            raise ValueError(f"{results_path} is not an eblint results file") from None
+    return (index, count), header["paths"]
+
+
+def read(results_path: str) -> Iterator[Tuple[int, str, List[Diagnostic]]]:
+    """Read the results from a results file written by `record`.
+
+    Args:
+        results_path: path to the results file
+
+    Yields:
+        the position, path and problems of every linted file
+    """
+    with open(results_path, "r") as results_file:
+        next(results_file)
+        for line in results_file:
+            entry = json.loads(line)
+            diagnostics = [Diagnostic(*fields) for fields in entry["diagnostics"]]
+            yield entry["position"], entry["path"], diagnostics
+
+
+def check_complete(headers: Iterable[Header]) -> Header:
+    """Check that results files cover every shard of the same run exactly once.
+
+    Args:
+        headers: descriptions of the runs, as read by `read_header`
+
+    Returns:
+        the description of a single run over all shards
+
+    Raises:
+        ValueError: the results files do not add up to a complete run
+    """
+    headers = list(headers)
+    shards = sorted(shard for shard, _ in headers)
+    paths = headers[0][1]
+    if any(other_paths != paths for _, other_paths in headers):
+        raise ValueError("Results files are of runs over different paths")
+    count = shards[0][1]
+    if any(other_count != count for _, other_count in shards):
+        raise ValueError("Results files are of runs with different numbers of shards")
+    indices = [index for index, _ in shards]
+    missing = [index for index in range(1, count + 1) if index not in indices]
+    if missing:
+        missing_shards = ", ".join(f"{index}/{count}" for index in missing)
+        raise ValueError(f"Results of shard(s) {missing_shards} missing")
+    repeated = sorted({index for index in indices if indices.count(index) > 1})
+    if repeated:
+        repeated_shards = ", ".join(f"{index}/{count}" for index in repeated)
+        raise ValueError(f"Results of shard(s) {repeated_shards} given more than once")
+    return (1, 1), paths
+
+
+def merge(
+    results_paths: Sequence[str],
+) -> Tuple[Header, Iterator[Tuple[str, List[Diagnostic]]]]:
+    """Combine results files of several shards into a single stream of results.
+
+    The results are put back in the discovery order, so they are the same as
+    those of linting all files in one run. Each results file is already in that
+    order, so they are merged without loading them completely.
+
+    Args:
+        results_paths: paths to the results files
+
+    Returns:
+        the description of the combined run, and the combined results
+
+    Raises:
+        ValueError: the results files are not every shard of one run exactly once
+    """
+    header = check_complete(read_header(path) for path in results_paths)
+    merged = heapq.merge(
+        *(read(results_path) for results_path in results_paths),
+        key=lambda entry: entry[0],
+    )
+    return header, ((path, diagnostics) for _, path, diagnostics in merged)
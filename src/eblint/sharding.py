@@ -0,0 +1,89 @@
+import argparse
+import hashlib
+import os
+from typing import Iterable, List, Tuple
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse a shard specification of the form `i/N`.
+
+    Shards are numbered from 1 up to and including N.
+
+    Args:
+        spec: shard specification, for example `2/4`
+
+    Returns:
+        the shard number and the number of shards
+    """
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid shard '{spec}', expected the form i/N"
+        ) from None
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(
+            f"invalid shard '{spec}', i must be between 1 and N"
+        )
+    return index, count
+
+
+def path_hash(path: str) -> str:
+    """Hash a path, identically on every machine and Python process.
+
+    Args:
+        path: path to be hashed
+    """
+    normalized_path = os.path.normpath(path).replace(os.sep, "/")
+    return hashlib.sha1(normalized_path.encode("utf-8")).hexdigest()
+
+
+def _file_size(path: str) -> int:
+    """Size of a file, or 0 if it cannot be read.
+
+    Files that cannot be read are still assigned to a shard, which reports them
+    when reading them fails.
+    """
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def shard_paths(paths: Iterable[str], index: int, count: int) -> List[Tuple[int, str]]:
+    """Select the files that belong to a shard.
+
+    Files are placed on a ring in the order of the hash of their path, and the ring
+    is cut into `count` consecutive parts of about the same total file size. Every
+    node that lists the same files therefore computes the same shards, and adding
+    or removing a file only moves files near the cuts to another shard.
+
+    Unlike the other stages, sharding needs the complete list of files.
+
+    Args:
+        paths: files to be divided over the shards, in discovery order
+        index: number of the shard to select, from 1 up to and including `count`
+        count: number of shards
+
+    Returns:
+        the position in `paths` and the path of every file in the shard, in
+        discovery order
+    """
+    # Weigh empty files as well, every file has some cost.
+    weighted_paths = [
+        (path_hash(path), position, path, _file_size(path) + 1)
+        for position, path in enumerate(paths)
+    ]
+    weighted_paths.sort()
+    total_weight = sum(weight for *_, weight in weighted_paths)
+
+    selected = []
+    cumulative_weight = 0
+    for _, position, path, weight in weighted_paths:
+        # A file belongs to the shard that contains the middle of its weight.
+        middle = cumulative_weight + weight / 2
+        if min(int(count * middle / total_weight), count - 1) == index - 1:
+            selected.append((position, path))
+        cumulative_weight += weight
+    selected.sort()
+    return selected
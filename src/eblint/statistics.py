@@ -0,0 +1,163 @@
+import json
+import os
+import tempfile
+from typing import Dict
+
+
+def _escape_label_value(value: str) -> str:
+    """Escape a label value for the Prometheus text exposition format.
+
+    Issue codes contain the names of rule profiles, which can be any string.
+    """
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class LintStatistics:
+    """Counters describing the throughput of a linting run.
+
+    Attributes:
+        files_linted: number of files that were run through the linter
+        bytes_read: number of bytes read from the linted files
+        parse_failures: number of files that could not be parsed
+        checker_failures: number of times a checker failed on a file
+        read_failures: number of files that could not be read
+        observer_failures: number of times reusing the parse of a file failed, for
+            example to extract its fields for `eblint dump`
+        violations: number of reported violations per issue code
+        wall_time: time spent linting, in seconds
+    """
+
+    FORMATS = ("json", "prometheus")
+
+    def __init__(self):
+        """Initiate LintStatistics with all counters at zero."""
+        self.files_linted = 0
+        self.bytes_read = 0
+        self.parse_failures = 0
+        self.checker_failures = 0
+        self.read_failures = 0
+        self.observer_failures = 0
+        self.violations: Dict[str, int] = {}
+        self.wall_time = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        """Number of files linted per second of wall time."""
+        if self.wall_time <= 0:
+            return 0.0
+        return self.files_linted / self.wall_time
+
+    def add_violations(self, issue_code: str, count: int):
+        """Add reported violations to the counter of an issue code.
+
+        Args:
+            issue_code: issue code of the reported violations
+            count: number of reported violations
+        """
+        self.violations[issue_code] = self.violations.get(issue_code, 0) + count
+
+    def merge(self, other: "LintStatistics"):
+        """Add the counters of another run to these counters.
+
+        Args:
+            other: counters collected by another linter, for example in a worker
+                process
+        """
+        self.files_linted += other.files_linted
+        self.bytes_read += other.bytes_read
+        self.parse_failures += other.parse_failures
+        self.checker_failures += other.checker_failures
+        self.read_failures += other.read_failures
+        self.observer_failures += other.observer_failures
+        for issue_code, count in other.violations.items():
+            self.add_violations(issue_code, count)
+        self.wall_time += other.wall_time
+
+    def as_dict(self) -> dict:
+        """Collect all counters in a dictionary."""
+        return {
+            "files_linted": self.files_linted,
+            "bytes_read": self.bytes_read,
+            "parse_failures": self.parse_failures,
+            "checker_failures": self.checker_failures,
+            "read_failures": self.read_failures,
+            "observer_failures": self.observer_failures,
+            "violations": dict(sorted(self.violations.items())),
+            "wall_time": self.wall_time,
+            "files_per_second": self.files_per_second,
+        }
+
+    def to_json(self) -> str:
+        """Render the counters as a JSON document."""
+        return json.dumps(self.as_dict(), indent=2) + "\n"
+
+    def to_prometheus(self) -> str:
+        """Render the counters in the Prometheus text exposition format.
+
+        The output is suitable for the textfile collector of the node exporter.
+        """
+        metrics = [
+            ("files_linted", "Number of files run through eblint.", self.files_linted),
+            ("bytes_read", "Number of bytes read from linted files.", self.bytes_read),
+            (
+                "parse_failures",
+                "Number of files that could not be parsed.",
+                self.parse_failures,
+            ),
+            (
+                "checker_failures",
+                "Number of times a checker failed on a file.",
+                self.checker_failures,
+            ),
+            (
+                "read_failures",
+                "Number of files that could not be read.",
+                self.read_failures,
+            ),
+            (
+                "observer_failures",
+                "Number of times reusing the parse of a file failed.",
+                self.observer_failures,
+            ),
+            ("wall_time_seconds", "Time spent linting.", self.wall_time),
+            ("files_per_second", "Linting throughput.", self.files_per_second),
+        ]
+        lines = []
+        for name, description, value in metrics:
+            lines.append(f"# HELP eblint_{name} {description}")
+            lines.append(f"# TYPE eblint_{name} gauge")
+            lines.append(f"eblint_{name} {value}")
+        lines.append("# HELP eblint_violations Number of reported violations.")
+        lines.append("# TYPE eblint_violations gauge")
+        for issue_code, count in sorted(self.violations.items()):
+            label = _escape_label_value(issue_code)
+            lines.append(f'eblint_violations{{issue_code="{label}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str, format: str = "json"):
+        """Write the counters to a file.
+
+        The file is replaced atomically, so that collectors never read a partially
+        written file.
+
+        Args:
+            path: file to write the counters to
+            format: one of `LintStatistics.FORMATS`
+        """
+        if format == "json":
+            content = self.to_json()
+        elif format == "prometheus":
+            content = self.to_prometheus()
+        else:
+            raise ValueError(f"Unknown statistics format '{format}'")
+
+        directory = os.path.dirname(os.path.abspath(path))
+        file_descriptor, temporary_path = tempfile.mkstemp(dir=directory, text=True)
+        try:
+            with os.fdopen(file_descriptor, "w") as stats_file:
+                stats_file.write(content)
+            os.chmod(temporary_path, 0o644)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
@@ -0,0 +1,377 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from . import pipeline
+from .baseline import Baseline
+from .diagnostic import Diagnostic
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .linter import Linter
+
+Changes = Tuple[Set[str], Set[str]]
+
+
+class PollingWatcher:
+    """Detects changed easyconfig files by comparing their modification times.
+
+    Attributes:
+        paths: files and directories being watched
+        interval: time between two scans, in seconds
+        snapshot: modification time and size of every watched file
+    """
+
+    def __init__(self, paths: Iterable[str], interval: float = 1.0):
+        """Initiate PollingWatcher.
+
+        Args:
+            paths: files and directories to be watched
+            interval: time between two scans, in seconds
+        """
+        self.paths = list(paths)
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        """Collect the modification time and size of every watched file."""
+        snapshot = {}
+        for path in pipeline.discover(self.paths):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def poll(self, timeout: float) -> Changes:
+        """Wait for files to change.
+
+        Args:
+            timeout: maximum time to wait, in seconds
+
+        Returns:
+            the files that were created or modified, and the files that were removed
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            time.sleep(max(min(self.interval, deadline - time.monotonic()), 0))
+            snapshot = self.scan()
+            changed = {
+                path
+                for path, state in snapshot.items()
+                if self.snapshot.get(path) != state
+            }
+            removed = set(self.snapshot) - set(snapshot)
+            self.snapshot = snapshot
+            if changed or removed or time.monotonic() >= deadline:
+                return changed, removed
+
+    def close(self):
+        """Stop watching."""
+
+
+class InotifyWatcher:
+    """Detects changed easyconfig files with the Linux inotify interface.
+
+    Directories are watched recursively, including directories created while
+    watching. Only the files reported by the kernel are looked at, unless its event
+    queue overflowed, in which case all watched files are reported.
+
+    Attributes:
+        roots: directories being watched
+        settle_time: time without events after which changes are reported, in seconds
+    """
+
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self, directories: Iterable[str], settle_time: float = 0.1):
+        """Initiate InotifyWatcher.
+
+        Args:
+            directories: directories to be watched
+            settle_time: time without events after which changes are reported
+
+        Raises:
+            OSError: inotify is not available on this system
+        """
+        self._libc = self.load_libc()
+        self.roots = list(directories)
+        self.settle_time = settle_time
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+        self._directories: Dict[int, str] = {}
+        for directory in self.roots:
+            self.add_directory(directory)
+
+    @staticmethod
+    def load_libc() -> ctypes.CDLL:
+        """Load the C library, if it provides inotify.
+
+        Raises:
+            OSError: inotify is not available on this system
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            raise OSError("The C library does not provide inotify")
+        libc.inotify_add_watch.argtypes = [
+            ctypes.c_int,
+            ctypes.c_char_p,
+            ctypes.c_uint32,
+        ]
+        return libc
+
+    def add_directory(self, directory: str) -> Set[str]:
+        """Watch a directory and all its subdirectories.
+
+        Args:
+            directory: directory to be watched
+
+        Returns:
+            the easyconfig files already present in the directory
+        """
+        found = set()
+        for root, _, filenames in os.walk(directory):
+            watch_descriptor = self._libc.inotify_add_watch(
+                self._fd, os.fsencode(root), self.WATCH_MASK
+            )
+            if watch_descriptor < 0:
+                error = ctypes.get_errno()
+                raise OSError(error, os.strerror(error), root)
+            self._directories[watch_descriptor] = root
+            found.update(
+                os.path.join(root, filename)
+                for filename in filenames
+                if filename.endswith(pipeline.EASYCONFIG_SUFFIX)
+            )
+        return found
+
+    def _read_events(self) -> List[Tuple[str, int]]:
+        """Read the pending events as pairs of path and event mask.
+
+        A queue overflow is not tied to a directory, and is read with an empty path.
+        """
+        events = []
+        buffer = os.read(self._fd, 65536)
+        offset = 0
+        while offset < len(buffer):
+            watch_descriptor, mask, _, length = self.EVENT_HEADER.unpack_from(
+                buffer, offset
+            )
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(buffer[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & self.IN_Q_OVERFLOW:
+                events.append(("", mask))
+                continue
+            directory = self._directories.get(watch_descriptor)
+            if directory is not None and name:
+                events.append((os.path.join(directory, name), mask))
+        return events
+
+    def poll(self, timeout: float) -> Changes:
+        """Wait for files to change.
+
+        Events are collected until none arrived for `settle_time`, so that a file
+        written in several steps is reported once. If the kernel dropped events,
+        everything is rescanned, see `rescan`.
+
+        Args:
+            timeout: maximum time to wait for the first event, in seconds
+
+        Returns:
+            the files that were created or modified, and the files and directories
+            that were removed
+        """
+        changed: Set[str] = set()
+        removed: Set[str] = set()
+        overflowed = False
+        wait_time = timeout
+        while select.select([self._fd], [], [], wait_time)[0]:
+            for path, mask in self._read_events():
+                if mask & self.IN_Q_OVERFLOW:
+                    overflowed = True
+                    continue
+                if mask & self.IN_ISDIR:
+                    if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                        changed.update(self.add_directory(path))
+                    elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                        removed.add(path)
+                    continue
+                if not path.endswith(pipeline.EASYCONFIG_SUFFIX):
+                    continue
+                if mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                    changed.discard(path)
+                    removed.add(path)
+                elif mask & (self.IN_CLOSE_WRITE | self.IN_MOVED_TO):
+                    removed.discard(path)
+                    changed.add(path)
+            wait_time = self.settle_time
+        if overflowed:
+            return self.rescan()
+        return changed, removed
+
+    def rescan(self) -> Changes:
+        """Report all watched files as changed, after events were lost.
+
+        Directories created since they were last seen are watched as well.
+
+        Returns:
+            every easyconfig file in the watched directories as changed, and the
+            watched directories as removed, so that files removed meanwhile are
+            forgotten
+        """
+        changed: Set[str] = set()
+        for directory in self.roots:
+            changed.update(self.add_directory(directory))
+        return changed, set(self.roots)
+
+    def close(self):
+        """Stop watching."""
+        os.close(self._fd)
+
+
+def create_watcher(paths: List[str], interval: float = 1.0):
+    """Create the most efficient watcher available.
+
+    Uses inotify when all paths are directories on a system that supports it,
+    and polling otherwise.
+
+    Args:
+        paths: files and directories to be watched
+        interval: time between two scans when polling, in seconds
+    """
+    if all(os.path.isdir(path) for path in paths):
+        try:
+            return InotifyWatcher(paths)
+        except OSError:
+            pass
+    return PollingWatcher(paths, interval=interval)
+
+
+class WatchSession:
+    """The current problems of a tree of easyconfig files, kept up to date.
+
+    Attributes:
+        linter: linter used to check changed files
+        baseline: known problems that are not reported
+        problems: the problems of every watched file
+    """
+
+    def __init__(self, linter: "Linter", baseline: Optional[Baseline] = None):
+        """Initiate WatchSession.
+
+        Args:
+            linter: linter used to check changed files
+            baseline: known problems that are not reported
+        """
+        self.linter = linter
+        self.baseline = baseline
+        self.problems: Dict[str, List[Diagnostic]] = {}
+
+    def update(
+        self,
+        changed: Iterable[str],
+        removed: Iterable[str] = (),
+        write: Callable[[str], None] = print,
+    ):
+        """Lint changed files and forget removed ones.
+
+        The problems of the changed files are written out. Changed files that
+        cannot be read are reported as read errors.
+
+        Args:
+            changed: files that were created or modified
+            removed: files and directories that were removed
+            write: function called with every formatted problem
+        """
+        for removed_path in removed:
+            prefix = os.path.join(removed_path, "")
+            for path in [p for p in self.problems if p.startswith(prefix)]:
+                del self.problems[path]
+            self.problems.pop(removed_path, None)
+        results = pipeline.lint_paths(self.linter, changed)
+        if self.baseline is not None:
+            results = self.baseline.filter(results)
+        for path, diagnostics in results:
+            self.problems[path] = diagnostics
+            for diagnostic in diagnostics:
+                write(str(diagnostic))
+
+    @property
+    def problem_count(self) -> int:
+        """The number of problems in all watched files."""
+        return sum(len(diagnostics) for diagnostics in self.problems.values())
+
+    def summary(self) -> str:
+        """Summarize the current problems of all watched files."""
+        counts: Dict[str, int] = {}
+        for diagnostics in self.problems.values():
+            for diagnostic in diagnostics:
+                code = diagnostic.qualified_code
+                counts[code] = counts.get(code, 0) + 1
+        failing_files = sum(1 for diagnostics in self.problems.values() if diagnostics)
+        summary = (
+            f"{self.problem_count} problem(s) in {failing_files} of "
+            f"{len(self.problems)} file(s)"
+        )
+        if counts:
+            summary += ": " + ", ".join(
+                f"{code}: {count}" for code, count in sorted(counts.items())
+            )
+        return summary
+
+
+def watch(
+    linter: "Linter",
+    paths: List[str],
+    baseline: Optional[Baseline] = None,
+    interval: float = 1.0,
+    write: Callable[[str], None] = print,
+) -> int:
+    """Lint files, and relint them whenever they change, until interrupted.
+
+    Args:
+        linter: linter used to check the files
+        paths: files and directories to be watched
+        baseline: known problems that are not reported
+        interval: time between two scans when polling, in seconds
+        write: function called with every formatted problem and summary
+
+    Returns:
+        the number of problems when interrupted
+    """
+    watcher = create_watcher(paths, interval=interval)
+    session = WatchSession(linter, baseline=baseline)
+    try:
+        session.update(pipeline.discover(paths), write=write)
+        write(session.summary())
+        while True:
+            changed, removed = watcher.poll(timeout=interval)
+            # A file can be removed again before it is read.
+            changed = sorted(path for path in changed if os.path.isfile(path))
+            if changed or removed:
+                session.update(changed, removed, write=write)
+                write(session.summary())
+    except KeyboardInterrupt:
+        return session.problem_count
+    finally:
+        watcher.close()
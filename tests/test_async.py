@@ -0,0 +1,105 @@
+import asyncio
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from eblint import pipeline
+from eblint.checkers import DEFAULT_CHECKERS
+from eblint.linter import Linter
+
+fail_file = "tests/testfiles/linter/fail/M001/two-missing-fields.eb"
+folder = "tests/testfiles/linter"
+
+
+@pytest.fixture
+def default_linter():
+    return Linter(DEFAULT_CHECKERS)
+
+
+async def collect(linter, paths, executor=None):
+    return [result async for result in linter.lint_paths_async(paths, executor)]
+
+
+def test_lint_source_async(default_linter):
+    with open(fail_file) as source_file:
+        source_code = source_file.read()
+    diagnostics = asyncio.run(default_linter.lint_source_async(source_code, fail_file))
+    assert diagnostics == default_linter.lint_source(source_code, fail_file)
+
+
+def test_lint_file_async(default_linter):
+    diagnostics = asyncio.run(default_linter.lint_file_async(fail_file))
+    assert len(diagnostics) == 2, "Wrong number of problems"
+    assert default_linter.statistics.bytes_read > 0, "Bytes read not counted"
+
+
+def test_lint_paths_async(default_linter):
+    results = asyncio.run(collect(default_linter, [folder]))
+    expected = list(pipeline.lint_paths(Linter(DEFAULT_CHECKERS), [folder]))
+    assert results == expected, "Results differ from synchronous pipeline"
+    assert len(results) == default_linter.statistics.files_linted
+
+
+def test_concurrent_lint_paths_async(default_linter):
+    async def lint_concurrently(executor):
+        return await asyncio.gather(
+            *(collect(default_linter, [folder], executor) for _ in range(4))
+        )
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = asyncio.run(lint_concurrently(executor))
+    assert all(result == results[0] for result in results), "Results differ"
+
+
+def test_concurrent_linters_shared_checkers():
+    checked_folder = "tests/testfiles/linter/fail"
+
+    async def lint_concurrently(executor):
+        return await asyncio.gather(
+            *(
+                collect(Linter(DEFAULT_CHECKERS), [checked_folder], executor)
+                for _ in range(8)
+            )
+        )
+
+    expected = list(pipeline.lint_paths(Linter(DEFAULT_CHECKERS), [checked_folder]))
+    switch_interval = sys.getswitchinterval()
+    # Switch threads often, so that checkers visiting files concurrently would mix
+    # up their state.
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for _ in range(5):
+                results = asyncio.run(lint_concurrently(executor))
+                assert all(result == expected for result in results), "Results differ"
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+
+def test_lint_paths_async_process_pool(default_linter):
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        results = asyncio.run(collect(default_linter, [folder], executor))
+    expected_linter = Linter(DEFAULT_CHECKERS)
+    expected = list(pipeline.lint_paths(expected_linter, [folder]))
+    assert results == expected, "Results differ from synchronous pipeline"
+    statistics = default_linter.statistics.as_dict()
+    expected_statistics = expected_linter.statistics.as_dict()
+    for counter in ("files_linted", "bytes_read", "parse_failures", "violations"):
+        assert statistics[counter] == expected_statistics[counter], counter
+
+
+def test_lint_paths_async_missing_file(default_linter):
+    missing_file = "tests/testfiles/non-existing-file.eb"
+    results = asyncio.run(collect(default_linter, [missing_file, fail_file]))
+    assert [path for path, _ in results] == [missing_file, fail_file]
+    (diagnostic,) = results[0][1]
+    assert diagnostic.issue_code == Linter.READ_ERROR_CODE
+    assert results[1][1], "Batch stopped at the unreadable file"
+    assert default_linter.statistics.read_failures == 1
+
+
+def test_lint_file_async_missing_file(default_linter):
+    missing_file = "tests/testfiles/non-existing-file.eb"
+    diagnostics = asyncio.run(default_linter.lint_file_async(missing_file))
+    assert [d.issue_code for d in diagnostics] == [Linter.READ_ERROR_CODE]
@@ -0,0 +1,111 @@
+import json
+
+import pytest
+
+from eblint import pipeline
+from eblint.baseline import Baseline
+from eblint.checkers import DEFAULT_CHECKERS
+from eblint.diagnostic import Diagnostic
+from eblint.linter import Linter, main
+
+fail_file = "tests/testfiles/linter/fail/M003/exchanged-fields.eb"
+
+
+@pytest.fixture
+def default_linter():
+    return Linter(DEFAULT_CHECKERS)
+
+
+def test_fingerprint_ignores_position():
+    diagnostic = Diagnostic("a.eb", 10, 0, "M003", "'x' defined before 'y'", "y")
+    shifted = diagnostic._replace(lineno=20, col_offset=4)
+    assert Baseline.fingerprint(diagnostic) == Baseline.fingerprint(shifted)
+    baseline = Baseline([Baseline.fingerprint(diagnostic)])
+    assert list(baseline.filter([("a.eb", [shifted])])) == [("a.eb", [])]
+
+
+def test_fingerprint_differs():
+    diagnostic = Diagnostic("a.eb", 10, 0, "M003", "'x' defined before 'y'", "y")
+    other_field = diagnostic._replace(message="'x' defined before 'z'", field="z")
+    baseline = Baseline([Baseline.fingerprint(diagnostic)])
+    assert list(baseline.filter([("a.eb", [other_field])])) == [
+        ("a.eb", [other_field])
+    ]
+
+
+def test_identical_problems():
+    diagnostic = Diagnostic("a.eb", 3, 0, "M005", "Field 'x' is forbidden", "x")
+    repeated = diagnostic._replace(lineno=7)
+    baseline = Baseline()
+    baseline.add([diagnostic])
+    assert len(baseline) == 1, "Problem not recorded"
+
+    added = repeated._replace(lineno=9)
+    results = list(baseline.filter([("a.eb", [diagnostic, repeated, added])]))
+    assert results == [("a.eb", [repeated, added])], "Repeated problems hidden"
+
+    baseline.add([diagnostic, repeated])
+    results = list(baseline.filter([("a.eb", [diagnostic, repeated, added])]))
+    assert results == [("a.eb", [added])], "New repeated problem hidden"
+
+
+def test_errors_not_recorded():
+    error = Diagnostic("a.eb", 1, 0, "E900", "Could not parse file")
+    baseline = Baseline()
+    baseline.add([error])
+    assert len(baseline) == 0, "Parse error recorded"
+    assert list(baseline.filter([("a.eb", [error])])) == [("a.eb", [error])]
+
+
+def test_filter(default_linter, tmp_path):
+    shifted_file = tmp_path / "shifted.eb"
+    with open(fail_file) as source_file:
+        shifted_file.write_text("\n\n" + source_file.read())
+
+    original = Baseline.from_results(
+        pipeline.lint_paths(default_linter, [str(shifted_file)])
+    )
+    assert len(original) > 0, "No problems recorded"
+
+    shifted_file.write_text("\n" + shifted_file.read_text() + "accept_eula = True\n")
+    results = list(
+        original.filter(pipeline.lint_paths(default_linter, [str(shifted_file)]))
+    )
+    codes = [d.issue_code for _, diagnostics in results for d in diagnostics]
+    assert sorted(codes) == ["M004", "M005"], "Known problems reported"
+
+
+def test_write_load(tmp_path):
+    baseline_file = tmp_path / "baseline.json"
+    baseline = Baseline([("M003", "a.eb", "y", "0123456789abcdef", 0)])
+    baseline.write(str(baseline_file))
+    assert json.loads(baseline_file.read_text())["version"] == Baseline.VERSION
+    assert Baseline.load(str(baseline_file)).fingerprints == baseline.fingerprints
+
+
+def test_load_unknown_version(tmp_path):
+    baseline_file = tmp_path / "baseline.json"
+    baseline_file.write_text('{"version": 0, "fingerprints": []}')
+    with pytest.raises(ValueError, match="Unsupported baseline version"):
+        Baseline.load(str(baseline_file))
+
+
+def test_cli_baseline(mocker, tmp_path, capsys):
+    baseline_file = str(tmp_path / "baseline.json")
+    mocker.patch("sys.argv", ["eblint", fail_file, "--write-baseline", baseline_file])
+    assert main() == 0, "Recorded problems reflected in the exit status"
+    assert capsys.readouterr().out == "", "Problems reported while writing baseline"
+
+    mocker.patch("sys.argv", ["eblint", fail_file, "--baseline", baseline_file])
+    main()
+    assert capsys.readouterr().out == "", "Known problems reported"
+
+
+def test_write_baseline_reports_errors(tmp_path, capsys):
+    baseline_file = str(tmp_path / "baseline.json")
+    error_folder = "tests/testfiles/linter/error"
+    status = main([error_folder, "--write-baseline", baseline_file])
+    output = capsys.readouterr().out
+    assert status == 1, "Errors not reflected in the exit status"
+    assert "E900" in output, "Errors not reported while writing baseline"
+    assert len(Baseline.load(baseline_file)) == 0, "Errors recorded"
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from eblint.linter import Linter, main
@@ -7,32 +9,58 @@ from pathlib import Path
 def test_single_file(mocker):
     testfile = "tests/testfiles/linter/pass/default-checkers-pass.eb"
     mocker.patch("sys.argv", ["eblint", testfile])
-    mocker.patch("eblint.linter.Linter.run")
+    mocker.patch("eblint.linter.Linter.lint_tree", return_value=[])
     main()
-    Linter.run.assert_called_once_with(testfile)
+    Linter.lint_tree.assert_called_once()
+    assert Linter.lint_tree.call_args.args[1] == testfile, "Wrong file linted"
 
 
 def test_no_file(mocker):
-    mocker.patch("eblint.linter.Linter.run")
+    mocker.patch("eblint.linter.Linter.lint_tree", return_value=[])
     with pytest.raises(SystemExit):
         main()
-    Linter.run.assert_not_called()
+    Linter.lint_tree.assert_not_called()
 
 
-def test_wrong_file(mocker):
+def test_wrong_file(mocker, capsys):
     non_existent_file = "tests/testfiles/non-existing-file.eb"
     assert not Path(non_existent_file).exists(), "Choose non-existing file"
     mocker.patch("sys.argv", ["eblint", non_existent_file])
-    with pytest.raises(FileNotFoundError):
-        main()
+    assert main() == 1
+    output = capsys.readouterr().out
+    assert f"{non_existent_file}:1:0: E902: Could not read file" in output
 
 
 def test_multiple_files(mocker):
     file_1 = "tests/testfiles/linter/pass/default-checkers-pass.eb"
     file_2 = "tests/testfiles/linter/fail/M001/one-missing-field.eb"
     mocker.patch("sys.argv", ["eblint", file_1, file_2])
-    mocker.patch("eblint.linter.Linter.run")
+    mocker.patch("eblint.linter.Linter.lint_tree", return_value=[])
+    main()
+    linted_files = [call.args[1] for call in Linter.lint_tree.call_args_list]
+    assert linted_files == [file_1, file_2], "Wrong files linted"
+
+
+def test_stats_file(mocker, tmp_path):
+    testfile = "tests/testfiles/linter/pass/default-checkers-pass.eb"
+    stats_file = tmp_path / "stats.json"
+    mocker.patch("sys.argv", ["eblint", testfile, "--stats-file", str(stats_file)])
+    main()
+    statistics = json.loads(stats_file.read_text())
+    assert statistics["files_linted"] == 1, "Wrong number of linted files"
+    assert statistics["bytes_read"] == Path(testfile).stat().st_size
+    assert statistics["parse_failures"] == 0, "Ghost parse failures"
+    assert statistics["violations"] == {
+        code: 0 for code in ("M001", "M002", "M003", "M004", "M005")
+    }, "Wrong violation counts"
+    assert statistics["wall_time"] > 0, "Wall time not recorded"
+
+
+def test_directory(mocker):
+    folder = "tests/testfiles/linter/fail/M002"
+    mocker.patch("sys.argv", ["eblint", folder])
+    mocker.patch("eblint.linter.Linter.lint_tree", return_value=[])
     main()
-    Linter.run.assert_any_call(file_1)
-    Linter.run.assert_called_with(file_2)
-    assert Linter.run.call_count == 2, "Wrong number of calls"
+    linted_files = [call.args[1] for call in Linter.lint_tree.call_args_list]
+    assert linted_files == sorted(linted_files), "Files not linted in sorted order"
+    assert len(linted_files) == 3, "Wrong number of files linted"
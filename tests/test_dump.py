@@ -0,0 +1,158 @@
+import ast
+import csv
+import json
+
+import pytest
+
+from eblint.checkers import DEFAULT_CHECKERS
+from eblint.dump import (
+    FIELD_NAMES,
+    ColumnarDumpWriter,
+    DumpWriter,
+    NpzDumpWriter,
+    ParquetDumpWriter,
+    extract,
+)
+from eblint.linter import Linter, main
+
+pass_file = "tests/testfiles/linter/pass/default-checkers-pass.eb"
+folder = "tests/testfiles/linter"
+
+
+@pytest.fixture
+def record():
+    with open(pass_file) as source_file:
+        return extract(pass_file, ast.parse(source_file.read()))
+
+
+def test_extract(record):
+    assert (record.name, record.version) == ("UCX-CUDA", "1.15.0")
+    assert record.versionsuffix == "-CUDA-%(cudaver)s"
+    assert (record.toolchain_name, record.toolchain_version) == ("GCCcore", "13.2.0")
+    assert record.fields[:4] == ("easyblock", "name", "version", "versionsuffix")
+    assert record.fields[-1] == "moduleclass", "Fields not in order"
+    assert ("UCX", "version") in record.dependencies, "Variable not kept as source"
+    assert ("CUDA", "12.5.0", "", "SYSTEM") in record.dependencies
+    assert ("binutils", "2.40") in record.builddependencies
+
+
+def test_field_mask(record):
+    present = {
+        name for index, name in enumerate(FIELD_NAMES) if record.field_mask >> index & 1
+    }
+    assert present == set(record.fields) & set(FIELD_NAMES), "Wrong presence bitmap"
+    assert "foo" in record.fields, "Unknown field missing from field order"
+
+
+def test_dump_csv(tmp_path, capsys):
+    output = tmp_path / "fields.csv"
+    status = main(["dump", "--format", "csv", "-o", str(output), folder])
+    assert status == 1, "Problems not reported"
+    assert "M001" in capsys.readouterr().out, "Problems not printed"
+    with open(output, newline="") as output_file:
+        rows = list(csv.DictReader(output_file))
+    paths = [row["path"] for row in rows]
+    assert pass_file in paths, "File missing from table"
+    assert not any("/E900/" in path for path in paths), "Unparsable file in table"
+    row = rows[paths.index(pass_file)]
+    assert row["toolchain_name"] == "GCCcore"
+    assert ["zlib", "1.2.13"] in json.loads(row["dependencies"])
+
+
+def test_dump_extract_error(tmp_path, mocker, capsys):
+    def extract_or_fail(path, tree):
+        if path == pass_file:
+            raise RecursionError("maximum recursion depth exceeded")
+        return extract(path, tree)
+
+    mocker.patch("eblint.dump.extract", side_effect=extract_or_fail)
+    output = tmp_path / "fields.csv"
+    main(["dump", "--format", "csv", "-o", str(output), folder])
+    expected = f"{pass_file}:1:0: E901: Observer failed: RecursionError"
+    assert expected in capsys.readouterr().out, "Failure not reported"
+    with open(output, newline="") as output_file:
+        paths = [row["path"] for row in csv.DictReader(output_file)]
+    assert pass_file not in paths, "Failed file in table"
+    assert len(paths) > 1, "Run stopped at the failed file"
+
+
+def test_observer_failure_counted():
+    def fail(path, tree):
+        raise RecursionError("maximum recursion depth exceeded")
+
+    linter = Linter(DEFAULT_CHECKERS)
+    diagnostics = linter.run_observer(fail, ast.parse("name = 'foo'"), "a.eb")
+    assert [d.issue_code for d in diagnostics] == [Linter.CHECKER_ERROR_CODE]
+    assert linter.statistics.observer_failures == 1, "Failure not counted"
+    assert linter.statistics.checker_failures == 0, "Counted as checker failure"
+
+
+def test_dump_missing_dependency(mocker, tmp_path, capsys):
+    mocker.patch.dict("sys.modules", {"pyarrow": None})
+    output = tmp_path / "fields.parquet"
+    with pytest.raises(SystemExit):
+        main(["dump", "--format", "parquet-compatible", "-o", str(output), folder])
+    assert "install eblint[parquet]" in capsys.readouterr().err
+
+
+def test_abstract_writers():
+    with pytest.raises(TypeError, match="abstract"):
+        DumpWriter()
+    with pytest.raises(TypeError, match="abstract"):
+        ColumnarDumpWriter("fields.out")
+
+
+def test_dump_npz(tmp_path):
+    numpy = pytest.importorskip("numpy")
+    output = tmp_path / "fields.npz"
+    main(["dump", "--format", "npz", "-o", str(output), folder])
+    with numpy.load(output) as table:
+        assert table["presence"].shape == (len(table["path"]), len(FIELD_NAMES))
+        checksums = list(table["field_names"]).index("checksums")
+        assert table["presence"][list(table["path"]).index(pass_file), checksums]
+
+
+def test_dump_parquet(tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    output = tmp_path / "fields.parquet"
+    main(["dump", "--format", "parquet-compatible", "-o", str(output), folder])
+    table = parquet.read_table(output).to_pydict()
+    row = table["path"].index(pass_file)
+    assert table["toolchain_name"][row] == "GCCcore"
+    assert ["zlib", "1.2.13"] in table["dependencies"][row]
+
+
+def test_dump_requires_output():
+    with pytest.raises(SystemExit):
+        main(["dump", folder])
+
+
+def test_parquet_row_groups(record, tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    output = tmp_path / "fields.parquet"
+    with ParquetDumpWriter(str(output), batch_size=2) as writer:
+        for _ in range(5):
+            writer.add(record)
+    metadata = parquet.ParquetFile(output).metadata
+    assert (metadata.num_row_groups, metadata.num_rows) == (3, 5)
+
+
+def test_parquet_incomplete(record, tmp_path):
+    pytest.importorskip("pyarrow.parquet")
+    output = tmp_path / "fields.parquet"
+    writer = ParquetDumpWriter(str(output), batch_size=2)
+    for _ in range(3):
+        writer.add(record)
+    writer.close(complete=False)
+    assert not output.exists(), "Incomplete file kept"
+
+
+def test_npz_batches(record, tmp_path):
+    numpy = pytest.importorskip("numpy")
+    output = tmp_path / "fields.npz"
+    with NpzDumpWriter(str(output), batch_size=2) as writer:
+        for _ in range(5):
+            writer.add(record)
+    with numpy.load(output) as table:
+        assert list(table["path"]) == [pass_file] * 5
+        assert table["presence"].shape == (5, len(FIELD_NAMES))
@@ -1,9 +1,16 @@
+import ast
 import os
 from typing import List, Tuple
 
 import pytest
 
-from eblint.checkers import DEFAULT_CHECKERS, MandatoryFieldChecker
+from eblint.checkers import (
+    DEFAULT_CHECKERS,
+    DependencyFormatChecker,
+    FieldOrderChecker,
+    ForbiddenFieldChecker,
+    MandatoryFieldChecker,
+)
 from eblint.linter import Linter
 
 DEFAULT_ISSUE_CODES = [c.issue_code for c in DEFAULT_CHECKERS]
@@ -24,6 +31,12 @@ with os.scandir(pass_folder) as folder_iterator:
         f"{pass_folder}/{item.name}" for item in folder_iterator if item.is_file()
     ]
 
+error_folder = "tests/testfiles/linter/error/E900"
+with os.scandir(error_folder) as folder_iterator:
+    parse_error_filenames = [
+        f"{error_folder}/{item.name}" for item in folder_iterator if item.is_file()
+    ]
+
 
 @pytest.fixture
 def mandatory_field_linter():
@@ -74,3 +87,77 @@ def test_default_linter_fail(issue_code, filename, default_linter):
             assert (
                 len(checker.violations) == 0
             ), f"Failed {checker.issue_code} on good file {filename}"
+
+
+@pytest.mark.parametrize("filename", parse_error_filenames)
+def test_parse_error(filename, default_linter):
+    diagnostics = default_linter.run(filename)
+    assert len(diagnostics) == 1, "Expected a single diagnostic"
+    assert diagnostics[0].issue_code == Linter.PARSE_ERROR_CODE, "Wrong issue code"
+    assert diagnostics[0].filename == filename, "Wrong filename"
+
+
+def test_checker_error():
+    linter = Linter(DependencyFormatChecker("D001"))
+    diagnostics = linter.lint_source("dependencies = [('foo', undefined_version)]")
+    assert len(diagnostics) == 1, "Expected a single diagnostic"
+    assert diagnostics[0].issue_code == Linter.CHECKER_ERROR_CODE, "Wrong issue code"
+    assert "KeyError" in diagnostics[0].message, "Exception not reported"
+    assert linter.statistics.checker_failures == 1, "Checker failure not counted"
+
+
+def test_batch_continues_after_error(default_linter):
+    filenames = parse_error_filenames + pass_filenames
+    for filename in filenames:
+        default_linter.run(filename)
+    assert default_linter.statistics.files_linted == len(filenames)
+    assert default_linter.statistics.parse_failures == len(parse_error_filenames)
+
+
+@pytest.fixture
+def profile_linter():
+    shared_checker = MandatoryFieldChecker(issue_code="M001", field_names=["name"])
+    return Linter(
+        profiles={
+            "strict": {
+                shared_checker,
+                FieldOrderChecker("M002", ["name", "version"], strict_mode=True),
+                ForbiddenFieldChecker("M005", ["accept_eula"]),
+            },
+            "legacy": {
+                shared_checker,
+                FieldOrderChecker("M002", ["name", "version"]),
+            },
+        }
+    )
+
+
+def test_profiles_single_parse(profile_linter, mocker):
+    mocker.spy(ast, "parse")
+    diagnostics = profile_linter.lint_source(
+        "easyblock = 'x'; name = 'foo'; version = '1'; accept_eula = True"
+    )
+    ast.parse.assert_called_once()
+    assert {(d.profile, d.issue_code) for d in diagnostics} == {
+        ("strict", "M002"),
+        ("strict", "M005"),
+    }, "Wrong problems per profile"
+    assert all(
+        str(d).endswith(f"{d.issue_code}[{d.profile}]: {d.message}")
+        for d in diagnostics
+    ), "Profile missing from formatted problem"
+
+
+def test_profiles_shared_checker(profile_linter):
+    diagnostics = profile_linter.lint_source("version = '1'")
+    assert sorted(d.qualified_code for d in diagnostics) == [
+        "M001[legacy]",
+        "M001[strict]",
+    ], "Shared checker not reported for every profile"
+    assert profile_linter.statistics.violations == {
+        "M001[legacy]": 1,
+        "M001[strict]": 1,
+        "M002[legacy]": 0,
+        "M002[strict]": 0,
+        "M005[strict]": 0,
+    }
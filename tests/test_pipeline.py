@@ -0,0 +1,81 @@
+import threading
+
+import pytest
+
+from eblint import pipeline
+from eblint.checkers import DEFAULT_CHECKERS
+from eblint.linter import Linter
+
+
+def test_discover_directory():
+    folder = "tests/testfiles/order_checker"
+    paths = list(pipeline.discover([folder]))
+    assert len(paths) == 10, "Wrong number of files discovered"
+    assert all(path.endswith(".eb") for path in paths), "Non-easyconfig discovered"
+
+
+def test_discover_file():
+    testfile = "tests/testfiles/non-existing-file.eb"
+    assert list(pipeline.discover([testfile])) == [testfile], "File not passed on"
+
+
+def test_lint_paths():
+    folder = "tests/testfiles/linter"
+    linter = Linter(DEFAULT_CHECKERS)
+    results = list(pipeline.lint_paths(linter, [folder]))
+    assert len(results) == linter.statistics.files_linted, "Files lost in pipeline"
+    codes = {d.issue_code for _, diagnostics in results for d in diagnostics}
+    assert {"M001", "M002", "M003", "M004", "M005", "E900"} <= codes
+
+
+def test_lint_paths_read_error(tmp_path):
+    broken_link = tmp_path / "broken.eb"
+    broken_link.symlink_to(tmp_path / "removed.eb")
+    testfile = "tests/testfiles/linter/pass/default-checkers-pass.eb"
+    linter = Linter(DEFAULT_CHECKERS)
+    results = list(pipeline.lint_paths(linter, [str(tmp_path), testfile]))
+    assert [path for path, _ in results] == [str(broken_link), testfile]
+    (diagnostic,) = results[0][1]
+    assert diagnostic.issue_code == Linter.READ_ERROR_CODE
+    assert linter.statistics.read_failures == 1
+    assert linter.statistics.files_linted == 1, "Unreadable file counted as linted"
+
+
+def test_report():
+    lines = []
+    linter = Linter(DEFAULT_CHECKERS)
+    testfile = "tests/testfiles/linter/fail/M001/two-missing-fields.eb"
+    count = pipeline.report(pipeline.lint_paths(linter, [testfile]), lines.append)
+    assert count == 2, "Wrong number of problems reported"
+    assert all(line.startswith(f"{testfile}:1:0: M001") for line in lines)
+
+
+@pytest.mark.parametrize("maxsize", [0, 1, 4])
+def test_buffered_order(maxsize):
+    assert list(pipeline.buffered(range(50), maxsize)) == list(range(50))
+
+
+def test_buffered_backpressure():
+    produced = []
+
+    def produce():
+        for item in range(100):
+            produced.append(item)
+            yield item
+
+    items = pipeline.buffered(produce(), maxsize=2)
+    assert next(items) == 0
+    threading.Event().wait(0.2)
+    assert len(produced) <= 4, "Producer ran ahead of the bounded queue"
+    items.close()
+
+
+def test_buffered_error():
+    def produce():
+        yield 1
+        raise FileNotFoundError("missing")
+
+    items = pipeline.buffered(produce(), maxsize=4)
+    assert next(items) == 1
+    with pytest.raises(FileNotFoundError):
+        next(items)
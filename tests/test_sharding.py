@@ -0,0 +1,120 @@
+import argparse
+import re
+
+import pytest
+
+from eblint import pipeline
+from eblint.linter import main
+from eblint.sharding import parse_shard, shard_paths
+
+folder = "tests/testfiles"
+all_paths = list(pipeline.discover([folder]))
+
+
+@pytest.mark.parametrize("spec,expected", [("1/1", (1, 1)), ("2/4", (2, 4))])
+def test_parse_shard(spec, expected):
+    assert parse_shard(spec) == expected
+
+
+@pytest.mark.parametrize("spec", ["0/2", "3/2", "1", "a/b", "1/2/3"])
+def test_parse_invalid_shard(spec):
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_shard(spec)
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7])
+def test_shards_partition_files(count):
+    shards = [shard_paths(all_paths, index, count) for index in range(1, count + 1)]
+    positions = sorted(position for shard in shards for position, _ in shard)
+    assert positions == list(range(len(all_paths))), "Shards do not partition files"
+    for shard in shards:
+        assert shard == sorted(shard), "Shard not in discovery order"
+        assert all(all_paths[position] == path for position, path in shard)
+
+
+def test_shards_deterministic():
+    assert shard_paths(all_paths, 1, 3) == shard_paths(list(all_paths), 1, 3)
+    reordered = [path for _, path in shard_paths(all_paths[::-1], 1, 3)]
+    assert sorted(reordered) == sorted(p for _, p in shard_paths(all_paths, 1, 3))
+
+
+def test_shards_balanced(tmp_path):
+    paths = []
+    for number in range(40):
+        path = tmp_path / f"file-{number}.eb"
+        path.write_text("x" * (100 * (number % 5 + 1)))
+        paths.append(str(path))
+    total = sum(len(open(path).read()) + 1 for path in paths)
+    for index in range(1, 5):
+        size = sum(len(open(p).read()) + 1 for _, p in shard_paths(paths, index, 4))
+        assert abs(size - total / 4) <= 500, "Shard not balanced by size"
+
+
+def test_shard_unreadable_files(capsys, tmp_path):
+    missing_file = str(tmp_path / "missing.eb")
+    (tmp_path / "dir").mkdir()
+    (tmp_path / "dir" / "broken.eb").symlink_to(tmp_path / "removed.eb")
+    output = ""
+    for index in range(1, 3):
+        main(["--shard", f"{index}/2", missing_file, str(tmp_path / "dir")])
+        output += capsys.readouterr().out
+    assert output.count("E902") == 2, "Unreadable files not reported once"
+
+
+def test_merge_matches_single_run(capsys, tmp_path):
+    single_results = str(tmp_path / "single.jsonl")
+    single_status = main([folder, "--results-file", single_results])
+    single_output = capsys.readouterr().out
+
+    shard_results = []
+    for index in range(1, 4):
+        shard_results.append(str(tmp_path / f"shard-{index}.jsonl"))
+        main([folder, "--shard", f"{index}/3", "--results-file", shard_results[-1]])
+    capsys.readouterr()
+
+    merged_results = str(tmp_path / "merged.jsonl")
+    merged_status = main(["merge", *shard_results, "--results-file", merged_results])
+    assert capsys.readouterr().out == single_output, "Merged report differs"
+    assert merged_status == single_status == 1, "Wrong exit status"
+    with open(single_results) as single, open(merged_results) as merged:
+        assert single.read() == merged.read(), "Merged results file differs"
+
+
+@pytest.fixture
+def shard_results(tmp_path, capsys):
+    def run(index, count, paths=(folder,)):
+        results_path = str(tmp_path / f"shard-{index}-{count}-{len(paths)}.jsonl")
+        main([*paths, "--shard", f"{index}/{count}", "--results-file", results_path])
+        capsys.readouterr()
+        return results_path
+
+    return run
+
+
+@pytest.mark.parametrize(
+    "shards,message",
+    [
+        ([(1, 3), (2, 3)], r"shard\(s\) 3/3 missing"),
+        ([(1, 2), (2, 2), (2, 2)], r"shard\(s\) 2/2 given more than once"),
+        ([(1, 2), (2, 3)], "different numbers of shards"),
+    ],
+)
+def test_merge_incomplete(shard_results, capsys, shards, message):
+    results_paths = [shard_results(index, count) for index, count in shards]
+    with pytest.raises(SystemExit):
+        main(["merge", *results_paths])
+    assert re.search(message, capsys.readouterr().err), "Incomplete merge accepted"
+
+
+def test_merge_different_paths(shard_results, capsys):
+    results_paths = [
+        shard_results(1, 2),
+        shard_results(2, 2, paths=(folder, "tests/testfiles/linter")),
+    ]
+    with pytest.raises(SystemExit):
+        main(["merge", *results_paths])
+    assert "different paths" in capsys.readouterr().err
+
+
+def test_exit_status_clean(capsys):
+    assert main(["tests/testfiles/linter/pass"]) == 0, "Problems in good files"
@@ -0,0 +1,84 @@
+import copy
+import json
+
+import pytest
+
+from eblint.checkers import DEFAULT_CHECKERS
+from eblint.linter import Linter
+from eblint.statistics import LintStatistics
+
+pass_file = "tests/testfiles/linter/pass/default-checkers-pass.eb"
+fail_file = "tests/testfiles/linter/fail/M001/two-missing-fields.eb"
+
+
+@pytest.fixture
+def statistics():
+    # Fresh checkers, so violations left behind by other tests are not counted.
+    linter = Linter(copy.deepcopy(DEFAULT_CHECKERS))
+    linter.clear_violations()
+    linter.run(pass_file)
+    linter.run(fail_file)
+    return linter.statistics
+
+
+def test_empty_statistics():
+    statistics = LintStatistics()
+    assert statistics.files_linted == 0, "files_linted not zero"
+    assert statistics.violations == {}, "violations not empty"
+    assert statistics.files_per_second == 0.0, "Throughput without wall time"
+
+
+def test_counters(statistics):
+    with open(pass_file, "rb") as file_1, open(fail_file, "rb") as file_2:
+        expected_bytes = len(file_1.read()) + len(file_2.read())
+    assert statistics.files_linted == 2, "Wrong number of linted files"
+    assert statistics.bytes_read == expected_bytes, "Wrong number of bytes read"
+    assert statistics.parse_failures == 0, "Ghost parse failures"
+    assert statistics.violations["M001"] == 2, "Wrong number of M001 violations"
+    assert statistics.wall_time > 0, "Wall time not recorded"
+    assert statistics.files_per_second > 0, "Throughput not computed"
+
+
+def test_parse_failure(tmp_path):
+    broken_file = tmp_path / "broken.eb"
+    broken_file.write_text("name = 'foo\n")
+    linter = Linter(DEFAULT_CHECKERS)
+    linter.run(str(broken_file))
+    assert linter.statistics.parse_failures == 1, "Parse failure not counted"
+
+
+def test_merge(statistics):
+    merged = LintStatistics()
+    merged.merge(statistics)
+    merged.merge(statistics)
+    assert merged.files_linted == 2 * statistics.files_linted, "Files not added"
+    assert merged.violations["M001"] == 4, "Violations not added"
+    assert merged.wall_time == 2 * statistics.wall_time, "Wall time not added"
+
+
+def test_write_json(statistics, tmp_path):
+    stats_file = tmp_path / "stats.json"
+    statistics.write(str(stats_file))
+    content = json.loads(stats_file.read_text())
+    assert content["files_linted"] == 2, "Wrong number of linted files"
+    assert content["violations"]["M001"] == 2, "Wrong number of M001 violations"
+
+
+def test_write_prometheus(statistics, tmp_path):
+    stats_file = tmp_path / "eblint.prom"
+    statistics.write(str(stats_file), format="prometheus")
+    lines = stats_file.read_text().splitlines()
+    assert "eblint_files_linted 2" in lines, "Missing files_linted metric"
+    assert 'eblint_violations{issue_code="M001"} 2' in lines, "Missing violations"
+
+
+def test_prometheus_label_escaping():
+    statistics = LintStatistics()
+    statistics.add_violations('M003[a"b\\c\nd]', 1)
+    lines = statistics.to_prometheus().splitlines()
+    assert 'eblint_violations{issue_code="M003[a\\"b\\\\c\\nd]"} 1' in lines
+
+
+def test_write_unknown_format(statistics, tmp_path):
+    with pytest.raises(ValueError, match="Unknown statistics format"):
+        statistics.write(str(tmp_path / "stats.txt"), format="xml")
@@ -0,0 +1,130 @@
+import os
+import shutil
+
+import pytest
+
+from eblint.checkers import DEFAULT_CHECKERS
+from eblint.linter import Linter, main
+from eblint.watch import InotifyWatcher, PollingWatcher, WatchSession, create_watcher
+
+pass_file = "tests/testfiles/linter/pass/default-checkers-pass.eb"
+fail_file = "tests/testfiles/linter/fail/M001/two-missing-fields.eb"
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / "sub").mkdir()
+    shutil.copy(pass_file, tmp_path / "good.eb")
+    shutil.copy(fail_file, tmp_path / "sub" / "bad.eb")
+    return tmp_path
+
+
+def edit(tree, watcher):
+    """Modify, create and remove files, and return the changes seen."""
+    shutil.copy(fail_file, tree / "good.eb")
+    shutil.copy(pass_file, tree / "sub" / "new.eb")
+    (tree / "notes.txt").write_text("not an easyconfig")
+    os.remove(tree / "sub" / "bad.eb")
+    return watcher.poll(timeout=2)
+
+
+def test_polling_watcher(tree):
+    watcher = PollingWatcher([str(tree)], interval=0.01)
+    # Make sure the modification time of the edited file changes.
+    os.utime(tree / "good.eb", ns=(0, 0))
+    watcher.snapshot = watcher.scan()
+    changed, removed = edit(tree, watcher)
+    assert changed == {str(tree / "good.eb"), str(tree / "sub" / "new.eb")}
+    assert removed == {str(tree / "sub" / "bad.eb")}
+    assert watcher.poll(timeout=0.05) == (set(), set()), "Ghost changes"
+
+
+def test_inotify_watcher(tree):
+    try:
+        watcher = InotifyWatcher([str(tree)])
+    except OSError:
+        pytest.skip("inotify not available")
+    try:
+        changed, removed = edit(tree, watcher)
+        (tree / "new-dir").mkdir()
+        shutil.copy(pass_file, tree / "new-dir" / "other.eb")
+        more_changed, _ = watcher.poll(timeout=2)
+    finally:
+        watcher.close()
+    assert changed == {str(tree / "good.eb"), str(tree / "sub" / "new.eb")}
+    assert removed == {str(tree / "sub" / "bad.eb")}
+    assert str(tree / "new-dir" / "other.eb") in more_changed, "New directory missed"
+
+
+def test_inotify_overflow(tree, mocker):
+    try:
+        watcher = InotifyWatcher([str(tree)])
+    except OSError:
+        pytest.skip("inotify not available")
+    read_events = watcher._read_events
+
+    def overflow():
+        read_events()
+        return [("", InotifyWatcher.IN_Q_OVERFLOW)]
+
+    mocker.patch.object(watcher, "_read_events", side_effect=overflow)
+    try:
+        (tree / "new-dir").mkdir()
+        shutil.copy(pass_file, tree / "new-dir" / "other.eb")
+        changed, removed = watcher.poll(timeout=2)
+    finally:
+        watcher.close()
+    assert changed == {
+        str(tree / "good.eb"),
+        str(tree / "sub" / "bad.eb"),
+        str(tree / "new-dir" / "other.eb"),
+    }, "Not all files rescanned"
+    assert removed == {str(tree)}, "Watched directory not reset"
+
+
+def test_create_watcher_for_files():
+    watcher = create_watcher([pass_file])
+    assert isinstance(watcher, PollingWatcher), "Files must be polled"
+
+
+def test_watch_session(tree, mocker):
+    linter = Linter(DEFAULT_CHECKERS)
+    lint_tree = mocker.spy(linter, "lint_tree")
+    session = WatchSession(linter)
+    lines = []
+    session.update(
+        [str(tree / "good.eb"), str(tree / "sub" / "bad.eb")], [], lines.append
+    )
+    assert session.problem_count == 2, "Wrong number of problems"
+    assert session.summary() == "2 problem(s) in 1 of 2 file(s): M001: 2"
+    assert len(lines) == 2, "Problems not written"
+
+    lint_tree.reset_mock()
+    session.update([str(tree / "good.eb")], [str(tree / "sub")], lines.append)
+    assert lint_tree.call_count == 1, "Unchanged files relinted"
+    assert session.problem_count == 0, "Problems of removed files kept"
+    assert session.summary() == "0 problem(s) in 0 of 1 file(s)"
+
+
+def test_watch_cli_conflict():
+    with pytest.raises(SystemExit):
+        main(["--watch", "tests/testfiles", "--shard", "1/2"])
+
+
+def test_watch_cli(mocker, tree, capsys):
+    mocker.patch("eblint.watch.create_watcher").return_value.poll.side_effect = (
+        KeyboardInterrupt
+    )
+    assert main(["--watch", str(tree)]) == 1, "Wrong exit status"
+    assert capsys.readouterr().out.endswith("2 problem(s) in 1 of 2 file(s): M001: 2\n")
+
+
+def test_watch_cli_missing_file(mocker, tree, capsys):
+    mocker.patch("eblint.watch.create_watcher").return_value.poll.side_effect = (
+        KeyboardInterrupt
+    )
+    missing_file = str(tree / "missing.eb")
+    assert main(["--watch", missing_file, str(tree / "good.eb")]) == 1
+    output = capsys.readouterr().out
+    assert f"{missing_file}:1:0: E902: Could not read file" in output
+    assert output.endswith("1 problem(s) in 1 of 2 file(s): E902: 1\n")